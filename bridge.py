@@ -299,6 +299,7 @@ async def save_admin(req: AdminSaveRequest):
 
 @app.post("/api/discovery/fetch")
 async def fetch_discovery_urls(req: DiscoveryRequest):
+    pipeline = None
     try:
         pipeline = EduSearchPipeline()
 
@@ -317,7 +318,7 @@ async def fetch_discovery_urls(req: DiscoveryRequest):
         # We pass the raw subtopics string from UI, or maybe the first one?
         # For now, let's just pass it as is.
 
-        results = pipeline.search(
+        results = await pipeline.search_async(
             grade=int(req.grade) if req.grade.isdigit() else 8,
             subject=req.subject,
             topic=req.topic,
@@ -359,6 +360,9 @@ async def fetch_discovery_urls(req: DiscoveryRequest):
                 "results": []
             }
         )
+    finally:
+        if pipeline:
+            await pipeline.aclose()
 
 @app.get("/api/projects/list")
 async def list_projects():
@@ -38,7 +38,8 @@ class CamoufoxEducationalSearcher:
 
     def __init__(self, headless: bool = True,
                  config_file: str = 'outputs/search_config.json',
-                 cache_dir: str = 'outputs/search_cache'):
+                 cache_dir: str = 'outputs/search_cache',
+                 navigation_timeout_ms: Optional[int] = None):
         """
         Initialize Camoufox searcher
 
@@ -46,8 +47,11 @@ class CamoufoxEducationalSearcher:
             headless: Run in headless mode (recommended for automation)
             config_file: Path to configuration file
             cache_dir: Directory for caching results
+            navigation_timeout_ms: Page navigation timeout; overrides
+                config 'search_timeout' when set
         """
         self.headless = headless
+        self.navigation_timeout_ms = navigation_timeout_ms
         self.config_file = Path(config_file)
         self.cache_dir = Path(cache_dir)
 
@@ -185,17 +189,24 @@ class CamoufoxEducationalSearcher:
                 "Accept-Language": "en-US,en;q=0.9"
             }
         )
+        self.context.set_default_navigation_timeout(self._navigation_timeout())
         self.page = self.context.new_page()
 
         print("✓ Camoufox started (stealth mode active, US Locale)\n")
 
+    def _navigation_timeout(self) -> int:
+        """Navigation timeout in ms (explicit setting wins over config)"""
+        return self.navigation_timeout_ms or self.config['search_timeout']
+
     def search_bing(self, query: str, **kwargs) -> List[Dict]:
         """
         Perform Bing search with Camoufox
 
         Args:
             query: Search query
-            **kwargs: count, filetype, freshness
+            **kwargs: count, filetype, freshness,
+                raise_on_navigation_error (re-raise instead of returning [],
+                so callers can retry)
         """
         if not self.page:
             self.start()
@@ -228,9 +239,11 @@ class CamoufoxEducationalSearcher:
 
         # Navigate (Camoufox handles anti-detection)
         try:
-            self.page.goto(url, timeout=self.config['search_timeout'])
+            self.page.goto(url, timeout=self._navigation_timeout())
         except Exception as e:
             print(f"✗ Navigation error: {e}")
+            if kwargs.get('raise_on_navigation_error'):
+                raise
             return []
 
         # Wait for results
@@ -7,7 +7,6 @@ Purpose:
 """
 
 import logging
-import asyncio
 from typing import List, Optional
 from discovery.search_manager import SearchManager
 
@@ -25,18 +24,17 @@ async def discover_urls(query: str, max_results: int = 10, method: str = "auto")
     Returns:
         List of discovered URLs
     """
-    logger.info(f"DiscoveryRouter: Routing query '{query}' (limit={max_results}, method={method})")
+    logger.info("DiscoveryRouter: Routing query '%s' (limit=%d, method=%s)", query, max_results, method)
 
     # Instantiate SearchManager
     search_mgr = SearchManager()
 
     try:
-        # Wrap blocking search in thread
-        urls = await asyncio.to_thread(search_mgr.search, query, max_results, method)
-        logger.info(f"DiscoveryRouter: Discovered {len(urls)} URLs")
+        urls = await search_mgr.async_search(query, max_results, method)
+        logger.info("DiscoveryRouter: Discovered %d URLs", len(urls))
         return urls
     except Exception as e:
-        logger.error(f"DiscoveryRouter: Search failed: {e}")
+        logger.error("DiscoveryRouter: Search failed: %s", e)
         return []
 
 def filter_urls(urls: List[str], source_type: str = "general") -> List[str]:
@@ -61,16 +59,16 @@ def filter_urls(urls: List[str], source_type: str = "general") -> List[str]:
 
         # 1. Global Blocklist Check
         if any(blocked in url_lower for blocked in BLOCKED_DOMAINS):
-            logger.debug(f"Blocked URL (global list): {url}")
+            logger.debug("Blocked URL (global list): %s", url)
             continue
 
         # 2. Trusted Filtering (If enabled)
         if source_type == "trusted":
             if not any(trusted in url_lower for trusted in TRUSTED_DOMAINS):
-                logger.debug(f"Filtered URL (not in trusted list): {url}")
+                logger.debug("Filtered URL (not in trusted list): %s", url)
                 continue
 
         filtered.append(url)
 
-    logger.info(f"DiscoveryRouter: Filtered {len(urls)} -> {len(filtered)} URLs (Mode: {source_type})")
+    logger.info("DiscoveryRouter: Filtered %d -> %d URLs (Mode: %s)", len(urls), len(filtered), source_type)
     return filtered
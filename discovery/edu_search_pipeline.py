@@ -21,29 +21,63 @@ CLI:
 """
 
 import time
+import asyncio
 import random
+import itertools
+import functools
+import threading
 import logging
 import json
+import re
 import sys
-from urllib.parse import urlparse
-from dataclasses import dataclass, field
+import hashlib
+from pathlib import Path
+from urllib.parse import urlsplit
+from dataclasses import dataclass, field, asdict
+from concurrent.futures import ThreadPoolExecutor
 try:
     from discovery.bing_search import EducationalContentSearcher
 except ImportError:
     EducationalContentSearcher = None
 
+# Backends raced against each other by fetch_ddg_async(); names differ
+# between the ddgs package and the older duckduckgo_search
 try:
     from ddgs import DDGS
+    DDG_BACKENDS: tuple[str, ...] = ("duckduckgo", "brave", "bing")
 except ImportError:
     try:
         from duckduckgo_search import DDGS
+        DDG_BACKENDS = ("html", "lite")
     except ImportError:
         DDGS = None
+        DDG_BACKENDS = ()
 
 # ═══════════════════════════════════════════════════════
 #  LOGGING
 # ═══════════════════════════════════════════════════════
 
+_LOG_FORMATTER = logging.Formatter(
+    "%(asctime)s | %(levelname)-8s | %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+_LOGGER_LOCK = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
+def _console_handler() -> logging.Handler:
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(_LOG_FORMATTER)
+    return console
+
+
+@functools.lru_cache(maxsize=None)
+def _file_handler(log_file: str) -> logging.Handler:
+    fh = logging.FileHandler(log_file, mode="a", encoding="utf-8")
+    fh.setFormatter(_LOG_FORMATTER)
+    return fh
+
+
 def setup_logger(
     name: str = "edu_search",
     level: int = logging.INFO,
@@ -52,24 +86,18 @@ def setup_logger(
     """
     Call once at startup. Without this, you get Python's default
     WARNING-only logger and miss all useful pipeline telemetry.
+    Repeat calls only update the level; handlers are shared singletons.
     """
     logger = logging.getLogger(name)
     logger.setLevel(level)
     if logger.handlers:
         return logger
 
-    fmt = logging.Formatter(
-        "%(asctime)s | %(levelname)-8s | %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
-    console = logging.StreamHandler(sys.stdout)
-    console.setFormatter(fmt)
-    logger.addHandler(console)
-
-    if log_file:
-        fh = logging.FileHandler(log_file, mode="a", encoding="utf-8")
-        fh.setFormatter(fmt)
-        logger.addHandler(fh)
+    with _LOGGER_LOCK:
+        if not logger.handlers:
+            logger.addHandler(_console_handler())
+            if log_file:
+                logger.addHandler(_file_handler(log_file))
 
     return logger
 
@@ -134,9 +162,194 @@ BLOCK_DOMAINS = [
     "instagram.com", "pinterest.com", "linkedin.com", "amazon.com"
 ]
 
+# Precomputed lookup tables (built once at import, read per query)
+_GRADE_BAND_TABLE: tuple[str, ...] = tuple(
+    "K-4" if g <= 4 else "5-8" if g <= 8 else "9-12" for g in range(21)
+)
+# At most 2 keywords per content type go into a query
+CONTENT_TYPE_KEYWORDS_TOP2: dict[str, tuple[str, ...]] = {
+    ct: tuple(kws[:2]) for ct, kws in CONTENT_TYPE_KEYWORDS.items()
+}
+
+# Anything outside word chars, whitespace, apostrophes/commas and query
+# operators is stripped
+_SANITIZE_RE = re.compile(r'[^\w\s":+\-()./\',]')
+
+# Unused pieces are filled with "" so one format_map call builds the query
+_QUERY_TEMPLATE = "Grade {grade} {subject} {topic}{subtopic}{keywords} {exclusions}{sites}"
+
 MAX_RETRIES = 3
 BASE_DELAY = 2.0
 INTER_REQUEST_DELAY = 1.5
+# Minimum spacing between calls to the same DDG backend, process-wide
+DDG_MIN_INTERVAL = 0.8
+
+_ddg_gate_lock = threading.Lock()
+_ddg_next_slot: dict[str, float] = {}
+
+
+def _ddg_gate(backend: str) -> None:
+    """
+    Pace calls to a DDG backend so they are at least DDG_MIN_INTERVAL apart
+    across every pipeline and thread. Each caller reserves the next free slot
+    under the lock and sleeps outside it, so waiters queue up in order.
+    """
+    with _ddg_gate_lock:
+        now = time.monotonic()
+        slot = max(now, _ddg_next_slot.get(backend, 0.0))
+        _ddg_next_slot[backend] = slot + DDG_MIN_INTERVAL
+    if slot > now:
+        time.sleep(slot - now)
+
+
+def _run_sync(coro, async_name: str):
+    """
+    asyncio.run(coro) for the blocking wrappers. asyncio.run can't nest, so
+    a call from inside a running event loop is refused with a message
+    naming the coroutine method to await instead.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    coro.close()
+    raise RuntimeError(
+        f"EduSearchPipeline's blocking wrappers can't run inside an event loop; "
+        f"await {async_name}() instead."
+    )
+
+
+# ═══════════════════════════════════════════════════════
+#  DOMAIN MATCHING
+# ═══════════════════════════════════════════════════════
+
+_TRIE_END = "$"
+
+
+def _build_domain_trie(domains) -> dict:
+    """
+    Reversed-label suffix trie, e.g. "ck12.org" -> {"org": {"ck12": {"$": True}}}.
+    """
+    trie: dict = {}
+    for d in domains:
+        node = trie
+        for label in reversed(d.lower().strip(".").split(".")):
+            node = node.setdefault(label, {})
+        node[_TRIE_END] = True
+    return trie
+
+
+@functools.lru_cache(maxsize=128)
+def _domain_trie_for(domains: tuple[str, ...]) -> dict:
+    """
+    Trie per distinct domain list. resolve_domains() hands back the same
+    lists for the same (grade, subject), so the build is paid once.
+    Callers must treat the returned trie as read-only.
+    """
+    return _build_domain_trie(domains)
+
+
+def _in_domain_trie(trie: dict, domain: str) -> bool:
+    """
+    True if domain is, or is a subdomain of, any domain in the trie.
+    Walks O(labels) instead of substring-scanning every entry, and
+    "fakeck12.org" no longer matches "ck12.org".
+    """
+    node = trie
+    for label in reversed(domain.partition(":")[0].split(".")):
+        node = node.get(label)
+        if node is None:
+            return False
+        if _TRIE_END in node:
+            return True
+    return False
+
+
+_BLOCK_DOMAIN_TRIE = _build_domain_trie(BLOCK_DOMAINS)
+# All exclude patterns in one alternation: one regex scan per URL
+_EXCLUDE_RE = re.compile("|".join(re.escape(p) for p in URL_EXCLUDE_PATTERNS))
+
+
+def _contains_any(text: str, needles) -> bool:
+    """Plain early-exit loop; avoids any()'s generator frame per call."""
+    for needle in needles:
+        if needle in text:
+            return True
+    return False
+
+
+@functools.lru_cache(maxsize=256)
+def _site_filter(domains: tuple[str, ...]) -> str:
+    """Cached body of EduSearchPipeline._build_site_filter()."""
+    if not domains:      return ""
+    if len(domains) == 1: return f"site:{domains[0]}"
+    return "(" + " OR ".join(f"site:{d}" for d in domains) + ")"
+
+
+def _sanitize_term(text: str) -> str:
+    """
+    Drop characters DDG tends to answer with a 202 rate-limit (#, *, ...)
+    and collapse whitespace/newlines, keeping the operator characters
+    + - : " ( ) used in the query syntax.
+    """
+    cleaned = " ".join(_SANITIZE_RE.sub(" ", text).split())
+    if cleaned != text:
+        logger.debug("Sanitized query term %r -> %r", text, cleaned)
+    return cleaned
+
+
+def _strip_query_frag(url: str) -> str:
+    """url.split("?")[0].split("#")[0] without the throwaway lists."""
+    q = url.find("?")
+    h = url.find("#")
+    if q == -1 and h == -1:
+        return url
+    if q == -1:
+        return url[:h]
+    if h == -1:
+        return url[:q]
+    return url[:min(q, h)]
+
+
+# Host of a plain http(s) URL, leading "www." dropped; anything else
+# (IPv6 literals, userinfo, other schemes) goes through urlsplit
+_NETLOC_RE = re.compile(r"https?://(?:www\.)?([^/?#@\[\]]+)(?=[/?#]|$)")
+
+
+def _netloc_of(url_lower: str) -> str:
+    """Host without "www." of an already lowercased URL; "" when it has none or can't be parsed."""
+    m = _NETLOC_RE.match(url_lower)
+    if m:
+        return m.group(1)
+    try:
+        # urlsplit skips urlparse's ;params scan, which we never use
+        netloc = urlsplit(url_lower).netloc
+    except ValueError:  # e.g. malformed IPv6 brackets
+        return ""
+    return netloc.replace("www.", "")
+
+
+@functools.lru_cache(maxsize=4096)
+def _analyze_url(url: str) -> tuple[str, str, str, bool]:
+    """
+    URL-only facts used by filter_results:
+    (normalized url, host without www., lowercased url, matches URL_EXCLUDE_PATTERNS).
+
+    Overlapping queries (e.g. subtopics of one topic) return the same URLs
+    again and again, so this is cached for the life of the process.
+    Trust/block decisions depend on per-call lists and are not cached here.
+    """
+    # Lowercase once; the host and the exclude scan both reuse this copy
+    full_url_lower = url.lower()
+    # Remove tracking params but keep path
+    norm = _strip_query_frag(url)
+    domain = _netloc_of(full_url_lower)
+
+    # Exclude patterns are all path fragments: scan only what follows the host
+    scheme_end = full_url_lower.find("://")
+    path_start = full_url_lower.find("/", scheme_end + 3 if scheme_end != -1 else 0)
+    is_excluded = path_start != -1 and _EXCLUDE_RE.search(full_url_lower, path_start) is not None
+    return norm, domain, full_url_lower, is_excluded
 
 
 # ═══════════════════════════════════════════════════════
@@ -152,7 +365,7 @@ class SearchError(Exception):
 #  DATA
 # ═══════════════════════════════════════════════════════
 
-@dataclass
+@dataclass(slots=True)
 class SearchResult:
     title: str
     url: str
@@ -167,6 +380,18 @@ class SearchResult:
         }
 
 
+@dataclass(slots=True)
+class SearchSpec:
+    """One (grade, subject, topic) request for EduSearchPipeline.search_many()."""
+    grade: int
+    subject: str
+    topic: str
+    subtopic: str | None = None
+    content_types: list[str] | None = None
+    extra_domains: list[str] | None = None
+    blocked_domains: list[str] | None = None
+
+
 # ═══════════════════════════════════════════════════════
 #  PIPELINE
 # ═══════════════════════════════════════════════════════
@@ -186,10 +411,47 @@ class EduSearchPipeline:
         core_domains: list[str] | None = None,
         band_domains: dict | None = None,
         content_keywords: dict | None = None,
+        navigation_timeout_ms: int = 8000,
+        max_retries: int = MAX_RETRIES,
+        cache_dir: str | None = "outputs/search_cache",
+        cache_max_age_s: int = 86400,
+        fail_ttl_s: float = 60.0,
     ):
         self.core_domains = core_domains or TRUSTED_DOMAINS_CORE
+        self._core_unique: tuple[str, ...] = tuple(dict.fromkeys(self.core_domains))
         self.band_domains = band_domains or TRUSTED_DOMAINS_BY_BAND
         self.content_keywords = content_keywords or CONTENT_TYPE_KEYWORDS
+        # Max 2 keywords per content type, sliced once instead of per query
+        self._content_kw_head: dict[str, tuple[str, ...]] = (
+            {ct: tuple(kws[:2]) for ct, kws in content_keywords.items()}
+            if content_keywords else CONTENT_TYPE_KEYWORDS_TOP2
+        )
+        self._keywords_cached = functools.lru_cache(maxsize=256)(self._keyword_string)
+        self._resolve_cached = functools.lru_cache(maxsize=512)(self._resolve_band_domains)
+        self._warm_site_filters()
+        # True while search_many() holds one browser open across fetches
+        self._browser_session = False
+        # Short navigation timeout + retries beats absorbing one long stall
+        self.navigation_timeout_ms = navigation_timeout_ms
+        self.max_retries = max(1, max_retries)
+        # One DDGS client per thread (see _ddg_client); every client made is
+        # also listed so close() can release them all
+        self._ddgs_local = threading.local()
+        self._ddgs_clients = []
+        self._ddgs_lock = threading.Lock()
+        # On-disk Bing result cache keyed by query hash (None disables it)
+        self.query_cache_dir = Path(cache_dir) / "query" if cache_dir else None
+        self.cache_max_age_s = cache_max_age_s
+        # Queries that just exhausted their retries fail fast until this
+        # monotonic deadline instead of re-running the whole retry loop
+        self.fail_ttl_s = fail_ttl_s
+        self._fail_until: dict[str, float] = {}
+        # The sync Playwright API is bound to the thread that started it,
+        # so every Bing call goes through this one worker thread
+        self._browser_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="edu-search-browser",
+        )
+        self._closed = False
 
         # Initialize the Bing searcher safely
         self.searcher = None
@@ -198,27 +460,87 @@ class EduSearchPipeline:
                 self.searcher = EducationalContentSearcher(
                     headless=True,
                     config_file='outputs/search_config.json',
-                    cache_dir='outputs/search_cache'
+                    cache_dir='outputs/search_cache',
+                    navigation_timeout_ms=navigation_timeout_ms,
                 )
             except Exception as e:
-                logger.warning(f"Failed to initialize EducationalContentSearcher: {e}")
+                logger.warning("Failed to initialize EducationalContentSearcher: %s", e)
         else:
             logger.warning("EducationalContentSearcher (Camoufox) not available. Scraper will be disabled.")
 
+    # ── Lifecycle ────────────────────────────────────
+
+    def close(self) -> None:
+        """
+        Release the DDG clients, the browser and its worker thread. Blocks
+        until the browser has shut down; async code should use aclose().
+        Calling it again is a no-op.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._close_ddg_clients()
+        try:
+            if self.searcher:
+                self._browser_executor.submit(self.searcher.close).result()
+        finally:
+            self._browser_executor.shutdown(wait=False)
+
+    async def aclose(self) -> None:
+        """close() for async callers: awaits the browser shutdown on its thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._close_ddg_clients()
+        try:
+            if self.searcher:
+                await self._run_in_browser_thread(self.searcher.close)
+        finally:
+            self._browser_executor.shutdown(wait=False)
+
+    def _close_ddg_clients(self) -> None:
+        with self._ddgs_lock:
+            clients, self._ddgs_clients = self._ddgs_clients, []
+            self._ddgs_local = threading.local()
+        for client in clients:
+            try:
+                client.__exit__(None, None, None)
+            except Exception as e:
+                logger.debug("Error closing DDGS client: %s", e)
+
+    def __enter__(self) -> "EduSearchPipeline":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    async def __aenter__(self) -> "EduSearchPipeline":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+
     # ── Helpers ──────────────────────────────────────
 
     @staticmethod
     def _get_grade_band(grade: int) -> str:
-        if grade <= 4:   return "K-4"
-        if grade <= 8:   return "5-8"
-        return "9-12"
+        if 0 <= grade < len(_GRADE_BAND_TABLE):
+            return _GRADE_BAND_TABLE[grade]
+        return "K-4" if grade < 0 else "9-12"
+
+    @classmethod
+    def _band_for(cls, grade) -> str:
+        """Grade band for a raw grade value; unparsable grades use the middle band."""
+        try:
+             grade_int = int(grade)
+        except ValueError:
+             grade_int = 8
+        return cls._get_grade_band(grade_int)
 
     @staticmethod
     def _build_site_filter(domains: list[str]) -> str:
         """Bing syntax: (site:a OR site:b OR ...)"""
-        if not domains:      return ""
-        if len(domains) == 1: return f"site:{domains[0]}"
-        return "(" + " OR ".join(f"site:{d}" for d in domains) + ")"
+        return _site_filter(tuple(domains))
 
     # ── Step 1: Domain Resolution ────────────────────
 
@@ -229,45 +551,69 @@ class EduSearchPipeline:
         Merge core + grade-band + subject-specific + extra domains.
         Returns deduplicated list preserving insertion order.
         """
-        domains = list(self.core_domains)
-        try:
-             grade_int = int(grade)
-        except ValueError:
-             # Default to middle band if grade parsing fails
-             grade_int = 8
+        band = self._band_for(grade)
+        result = list(self._resolve_cached(band, subject.lower(), tuple(extra_domains or ())))
+        logger.debug("Resolved %d domains for Grade %s %s", len(result), grade, subject)
+        return result
 
-        band = self._get_grade_band(grade_int)
+    def _resolve_band_domains(
+        self, band: str, subject_lower: str, extra_domains: tuple[str, ...],
+    ) -> tuple[str, ...]:
+        """
+        Uncached body of resolve_domains(), memoized per instance as
+        _resolve_cached since the domain tables never change for the life
+        of the pipeline. Returns a tuple so cached values can't be mutated.
+        """
         band_map = self.band_domains.get(band, {})
 
         # Fuzzy match subject to band keys
-        subject_lower = subject.lower()
-        matched = False
+        subject_domains: list[str] = []
         for key, domain_list in band_map.items():
             if key in subject_lower or subject_lower in key:
-                domains.extend(domain_list)
-                matched = True
+                subject_domains = domain_list
                 break
 
-        if not matched:
+        if not subject_domains:
             logger.debug(
-                f"No subject-specific domains for '{subject}' in band {band}. "
-                f"Using core domains only."
+                "No subject-specific domains for '%s' in band %s. Using core domains only.",
+                subject_lower, band,
             )
 
-        # Always include reference alternatives for the band
-        if "reference" in band_map:
-            domains.extend(band_map["reference"])
-
-        if extra_domains:
-            domains.extend(extra_domains)
-
-        # Deduplicate preserving order
-        result = list(dict.fromkeys(domains))
-        logger.debug(f"Resolved {len(result)} domains for Grade {grade} {subject}")
-        return result
+        # Seed with the pre-deduplicated core list, then one ordered pass
+        # with a seen-set over the rest: no intermediate merged list
+        result = list(self._core_unique)
+        seen = set(result)
+        for d in itertools.chain(
+            subject_domains,
+            band_map.get("reference", ()),  # Always include band reference alternatives
+            extra_domains,
+        ):
+            if d not in seen:
+                seen.add(d)
+                result.append(d)
+        return tuple(result)
+
+    def _warm_site_filters(self) -> None:
+        """
+        Resolve every (grade band, subject) pair in the domain tables once
+        and build its site: filter, so build_query() only ever hits the
+        _resolve_cached and _site_filter caches on the hot path.
+        """
+        for band, band_map in self.band_domains.items():
+            for subject_key in band_map:
+                if subject_key != "reference":
+                    _site_filter(self._resolve_cached(band, subject_key, ()))
 
     # ── Step 2: Query Construction ───────────────────
 
+    def _keyword_string(self, content_types: tuple[str, ...]) -> str:
+        """Keyword suffix for a content-type combination, memoized as _keywords_cached."""
+        return "".join(
+            " " + kw
+            for ct in content_types
+            for kw in self._content_kw_head.get(ct, ())
+        )
+
     def build_query(
         self,
         grade: int,
@@ -286,162 +632,317 @@ class EduSearchPipeline:
           -exclusion1 -exclusion2
           (site:a OR site:b OR ...)
         """
-        # Removed strict quotes to allow better fuzzy matching (e.g. "8th Grade" vs "Grade 8")
-        parts = [f'Grade {grade}', f'{subject}', f'{topic}']
-        if subtopic:
-            parts.append(f'{subtopic}')
-
-        if content_types:
-            for ct in content_types:
-                kws = self.content_keywords.get(ct, [])
-                parts.extend(kws[:2])  # Max 2 per type
-
-        try:
-             grade_int = int(grade)
-        except ValueError:
-             grade_int = 8
+        return self._build_query_band(
+            grade, self._band_for(grade), subject, topic, subtopic, content_types, domains,
+        )
 
-        band = self._get_grade_band(grade_int)
-        excl = GRADE_EXCLUSIONS.get(band, "")
-        if excl:
-            parts.append(excl)
+    def _build_query_band(
+        self,
+        grade: int,
+        band: str,
+        subject: str,
+        topic: str,
+        subtopic: str | None = None,
+        content_types: list[str] | None = None,
+        domains=None,
+    ) -> str:
+        """build_query() body for callers that already resolved the grade band."""
+        keywords = self._keywords_cached(tuple(content_types)) if content_types else ""
 
+        sites = ""
         if domains:
             site_str = self._build_site_filter(domains)
             if site_str:
-                parts.append(site_str)
+                sites = " " + site_str
 
-        query = " ".join(parts)
-
-        logger.debug(f"Built query: {query}")
+        # Removed strict quotes to allow better fuzzy matching (e.g. "8th Grade" vs "Grade 8")
+        subtopic = _sanitize_term(subtopic) if subtopic else ""
+        query = _QUERY_TEMPLATE.format_map({
+            "grade": grade,
+            "subject": _sanitize_term(subject),
+            "topic": _sanitize_term(topic),
+            "subtopic": f" {subtopic}" if subtopic else "",
+            "keywords": keywords,
+            "exclusions": GRADE_EXCLUSIONS[band],
+            "sites": sites,
+        })
+
+        logger.debug("Built query: %s", query)
         return query
 
     # ── Step 3: Fetch ────────────────────────────────
 
+    def _cache_path(self, query: str, max_results: int) -> Path:
+        key = hashlib.blake2b(
+            f"{max_results}\n{query}".encode("utf-8"), digest_size=16,
+        ).hexdigest()
+        return self.query_cache_dir / f"{key}.json"
+
+    def _load_cached(self, query: str, max_results: int) -> list[dict] | None:
+        if not self.query_cache_dir:
+            return None
+        path = self._cache_path(query, max_results)
+        try:
+            if time.time() - path.stat().st_mtime > self.cache_max_age_s:
+                return None
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def _store_cached(self, query: str, max_results: int, results: list[dict]) -> None:
+        if not self.query_cache_dir or not results:
+            return
+        try:
+            self.query_cache_dir.mkdir(parents=True, exist_ok=True)
+            self._cache_path(query, max_results).write_text(
+                json.dumps(results, ensure_ascii=False), encoding="utf-8",
+            )
+        except OSError as e:
+            logger.warning("Could not write search cache: %s", e)
+
+    def _recently_failed(self, key: str) -> bool:
+        deadline = self._fail_until.get(key)
+        if deadline is None:
+            return False
+        if deadline > time.monotonic():
+            return True
+        self._fail_until.pop(key, None)
+        return False
+
+    def _mark_failed(self, key: str) -> None:
+        if self.fail_ttl_s > 0:
+            self._fail_until[key] = time.monotonic() + self.fail_ttl_s
+
     def fetch(
         self,
         query: str,
         max_results: int = 10,
+        force_refresh: bool = False,
     ) -> list[dict]:
         """
         Execute Bing search using EducationalContentSearcher.
 
         Returns raw result dicts with keys: title, url, snippet.
+        Results younger than cache_max_age_s are served from the on-disk
+        cache unless force_refresh is set. Navigation failures are retried
+        up to max_retries times with exponential backoff plus jitter; a query
+        that still fails is refused for fail_ttl_s seconds without retrying.
         """
+        if not force_refresh:
+            cached = self._load_cached(query, max_results)
+            if cached is not None:
+                logger.info("Search cache hit (%d results)", len(cached))
+                return cached
+
         if not self.searcher:
             raise SearchError("Bing scraper (EducationalContentSearcher) is not available.")
 
+        fail_key = f"bing\n{max_results}\n{query}"
+        if self._recently_failed(fail_key):
+            raise SearchError(f"Bing search for this query failed in the last {self.fail_ttl_s:.0f}s; skipping.")
+
         try:
             self.searcher.start()
-            results = self.searcher.search_bing(query, count=max_results)
-            return results
+            for attempt in range(self.max_retries):
+                try:
+                    results = self.searcher.search_bing(
+                        query, count=max_results, raise_on_navigation_error=True,
+                    )
+                    self._store_cached(query, max_results, results)
+                    return results
+                except Exception as e:
+                    if attempt == self.max_retries - 1:
+                        raise
+                    delay = BASE_DELAY * (2 ** attempt) + random.uniform(0, 0.5)
+                    logger.warning(
+                        "Bing navigation failed (attempt %d/%d): %s. Retrying in %.1fs",
+                        attempt + 1, self.max_retries, e, delay,
+                    )
+                    time.sleep(delay)
         except Exception as e:
-            logger.error(f"Bing search failed: {e}")
+            logger.error("Bing search failed: %s", e)
+            self._mark_failed(fail_key)
             raise SearchError(f"Bing search failed: {e}")
         finally:
-            if self.searcher:
+            if self.searcher and not self._browser_session:
                 self.searcher.close()
 
-    def fetch_ddg(self, query: str, max_results: int = 10) -> list[dict]:
+    def _ddg_client(self):
+        """
+        Long-lived DDGS client for the calling thread, so retries, backends
+        and repeat searches reuse its pooled connections instead of a fresh
+        TCP/TLS handshake per call. DDGS is not documented as thread-safe
+        and mutates its HTTP session per request, so concurrent to_thread()
+        workers each get their own client rather than sharing one.
+        Created lazily on a thread's first use.
+        """
+        local = self._ddgs_local
+        client = getattr(local, "client", None)
+        if client is None:
+            client = local.client = DDGS()
+            with self._ddgs_lock:
+                self._ddgs_clients.append(client)
+        return client
+
+    def fetch_ddg(
+        self, query: str, max_results: int = 10, backend: str = "auto",
+    ) -> list[dict]:
         """
         Execute DuckDuckGo search using duckduckgo_search library.
-        Robust fallback method.
+        Robust fallback method. A backend that raised for this query (e.g. a
+        rate limit) is skipped for fail_ttl_s seconds.
         """
         if not DDGS:
             logger.error("DuckDuckGo search library not installed.")
             return []
 
+        fail_key = f"ddg:{backend}\n{max_results}\n{query}"
+        if self._recently_failed(fail_key):
+            logger.info("DDG search (%s) failed recently for this query; skipping", backend)
+            return []
+
         try:
-            logger.info(f"Executing DDG Search: {query}")
+            logger.info("Executing DDG Search (%s): %s", backend, query)
             results = []
-            with DDGS() as ddgs:
-                # ddgs.text returns an iterator of dicts {'title':..., 'href':..., 'body':...}
-                ddg_results = ddgs.text(query, max_results=max_results)
-                for r in ddg_results:
-                    results.append({
-                        "title": r.get('title', ''),
-                        "url": r.get('href', ''),
-                        "snippet": r.get('body', '')
-                    })
-            logger.info(f"DDG Search returned {len(results)} results")
+            _ddg_gate(backend)
+            # ddgs.text returns an iterator of dicts {'title':..., 'href':..., 'body':...}
+            ddg_results = self._ddg_client().text(query, max_results=max_results, backend=backend)
+            # Some backends yield past max_results; stop reading at the cap
+            for r in itertools.islice(ddg_results, max_results):
+                results.append({
+                    "title": r.get('title', ''),
+                    "url": r.get('href', ''),
+                    "snippet": r.get('body', '')
+                })
+            logger.info("DDG Search (%s) returned %d results", backend, len(results))
             return results
         except Exception as e:
-            logger.error(f"DDG search failed: {e}")
+            logger.error("DDG search (%s) failed: %s", backend, e)
+            self._mark_failed(fail_key)
             return []
 
+    async def fetch_ddg_async(self, query: str, max_results: int = 10) -> list[dict]:
+        """
+        DDG search off the event loop: the backends in DDG_BACKENDS are
+        tried one at a time in a worker thread, stopping at the first
+        non-empty answer. They are not raced, because a to_thread() task
+        can't be cancelled once running: a losing request would still take
+        a _ddg_gate slot and could mark its query as failed.
+        """
+        if not DDGS:
+            logger.error("DuckDuckGo search library not installed.")
+            return []
+
+        for backend in DDG_BACKENDS:
+            results = await asyncio.to_thread(self.fetch_ddg, query, max_results, backend)
+            if results:
+                return results
+        return []
+
+    async def _run_in_browser_thread(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._browser_executor, fn, *args)
+
     # ── Step 4: Filter ───────────────────────────────
 
     def filter_results(
         self,
-        raw_results: list[dict],
+        raw_results,
         trusted_domains: list[str],
         blocked_domains: list[str] | None = None,
         strict: bool = False,
+        limit: int | None = None,
     ) -> list[SearchResult]:
         """
         Deduplicate, validate, and rank results.
 
         strict=False (default): All results returned, trusted sorted first.
         strict=True: Only trusted-domain results returned.
+        limit: keep at most this many; raw_results may be any iterable and is
+        no longer consumed once `limit` trusted results have been found.
         """
         seen: set[str] = set()
-        output: list[SearchResult] = []
-
-        # Prepare Blocklist
-        active_blocks = set(BLOCK_DOMAINS)
+        # Trusted-first ranking is a stable two-way partition, so build the
+        # halves directly instead of sorting on a binary key afterwards
+        trusted: list[SearchResult] = []
+        other: list[SearchResult] = []
+
+        # Prepare Blocklist: real domain names go in a suffix trie, bare
+        # keywords (no dot) keep the old substring-anywhere semantics
+        block_trie = _BLOCK_DOMAIN_TRIE
+        block_keywords: tuple[str, ...] = ()
         if blocked_domains:
-            active_blocks.update(d.lower() for d in blocked_domains if d)
+            extra = [d.lower() for d in blocked_domains if d]
+            block_trie = _domain_trie_for(
+                tuple(itertools.chain(BLOCK_DOMAINS, (d for d in extra if "." in d)))
+            )
+            block_keywords = tuple(d for d in extra if "." not in d)
+
+        trusted_trie = _domain_trie_for(tuple(trusted_domains))
+        # Result pages repeat hosts heavily: decide trust once per host and
+        # answer repeats with a dict probe instead of another trie walk
+        trust_by_domain: dict[str, bool] = {}
 
         # 1. Basic Filtering & Normalization
+        raw_count = 0
         for r in raw_results:
+            raw_count += 1
             url = r.get("url", "")
             if not url:
                 continue
 
-            # Remove tracking params but keep path
-            norm = url.split("?")[0].split("#")[0]
-
-            # Domain Check
-            try:
-                domain = urlparse(url).netloc.lower().replace("www.", "")
-                full_url_lower = url.lower()
-            except:
+            norm, domain, full_url_lower, is_excluded = _analyze_url(url)
+            if not domain:
                 continue
 
             # Blocklist Check
-            if any(bd in domain or bd in full_url_lower for bd in active_blocks):
+            if _in_domain_trie(block_trie, domain):
+                continue
+            if block_keywords and _contains_any(full_url_lower, block_keywords):
                 continue
             seen.add(norm)
 
-            if any(pat in url.lower() for pat in URL_EXCLUDE_PATTERNS):
+            if is_excluded:
                 continue
 
-            domain = urlparse(url).netloc.replace("www.", "")
-            is_trusted = any(td in domain for td in trusted_domains)
+            is_trusted = trust_by_domain.get(domain)
+            if is_trusted is None:
+                is_trusted = trust_by_domain[domain] = _in_domain_trie(trusted_trie, domain)
 
             if strict and not is_trusted:
                 continue
 
-            output.append(SearchResult(
+            (trusted if is_trusted else other).append(SearchResult(
                 title=r.get("title", ""),
                 url=url,
                 snippet=r.get("snippet", ""),
                 domain=domain,
                 is_trusted=is_trusted,
             ))
+            # Trusted results rank first, so nothing later can displace them
+            if limit is not None and len(trusted) >= limit:
+                break
 
-        output.sort(key=lambda x: (0 if x.is_trusted else 1))
+        output = trusted + other
+        if limit is not None:
+            output = output[:limit]
 
         logger.info(
-            f"Filtered: {len(raw_results)} raw → {len(output)} results "
-            f"({sum(1 for r in output if r.is_trusted)} trusted, "
-            f"{sum(1 for r in output if not r.is_trusted)} other)"
+            "Filtered: %d raw → %d results (%d trusted, %d other)",
+            raw_count, len(output), len(trusted), len(other),
         )
         return output
 
     # ── Orchestrator ─────────────────────────────────
 
-    def search(
+    def search(self, *args, **kwargs) -> list[SearchResult]:
+        """
+        Blocking wrapper around search_async() for sync callers and the CLI.
+        Sync-only: inside a running event loop, await search_async() instead.
+        """
+        return _run_sync(self.search_async(*args, **kwargs), "search_async")
+
+    async def search_async(
         self,
         grade: int,
         subject: str,
@@ -454,22 +955,29 @@ class EduSearchPipeline:
         safesearch: str = "moderate",
         max_results: int = 10,
         strict_domain_filter: bool = False,
-        method: str = "auto"
+        method: str = "auto",
+        force_refresh: bool = False,
     ) -> list[SearchResult]:
         """
         Full pipeline: resolve → build → fetch → filter.
         Includes automatic fallback if strict domain filtering yields no results.
 
+        Fetches run off the event loop: Bing on the pipeline's single browser
+        thread, DDG via asyncio.to_thread. The relaxed DDG query is only sent
+        once the strict one has come back without usable results.
+
         Args:
             method: "auto", "bing" (scraper), or "ddg" (api-like)
+            force_refresh: bypass the on-disk Bing result cache
         """
         logger.info(
-            f"Starting search ({method}): Grade {grade} {subject} > {topic}"
-            + (f" > {subtopic}" if subtopic else "")
+            "Starting search (%s): Grade %s %s > %s%s",
+            method, grade, subject, topic, f" > {subtopic}" if subtopic else "",
         )
 
-        # 1. Resolve Domains
-        domains = self.resolve_domains(grade, subject, extra_domains)
+        # 1. Resolve Domains (band parsed once, reused for every query below)
+        band = self._band_for(grade)
+        domains = self._resolve_cached(band, subject.lower(), tuple(extra_domains or ()))
 
         # 2. Determine Strategy
         use_bing = False
@@ -494,12 +1002,14 @@ class EduSearchPipeline:
 
         # Primary Attempt
         if use_bing:
-            query = self.build_query(grade, subject, topic, subtopic, content_types, domains)
+            query = self._build_query_band(grade, band, subject, topic, subtopic, content_types, domains)
             try:
-                raw = self.fetch(query, max_results)
-                results = self.filter_results(raw, domains, blocked_domains, strict_domain_filter)
+                raw = await self._run_in_browser_thread(self.fetch, query, max_results, force_refresh)
+                results = self.filter_results(
+                    raw, domains, blocked_domains, strict_domain_filter, limit=max_results,
+                )
             except Exception as e:
-                logger.warning(f"Bing strategy failed: {e}. Switching to fallback.")
+                logger.warning("Bing strategy failed: %s. Switching to fallback.", e)
                 use_ddg = True # Trigger fallback
 
         if use_ddg or (not results and method == "auto"):
@@ -508,23 +1018,69 @@ class EduSearchPipeline:
             # DDG query usually works better without "site:..." overloading in the query string itself
             # But we can try the same query first
             # Rebuild query for DDG (maybe simpler?)
-            query = self.build_query(grade, subject, topic, subtopic, content_types, domains)
-            raw = self.fetch_ddg(query, max_results)
-            results = self.filter_results(raw, domains, blocked_domains, strict_domain_filter)
+            query = self._build_query_band(grade, band, subject, topic, subtopic, content_types, domains)
+            raw = await self.fetch_ddg_async(query, max_results)
+            results = self.filter_results(
+                raw, domains, blocked_domains, strict_domain_filter, limit=max_results,
+            )
 
             # If strictly filtered DDG returned nothing, try relaxed DDG
             if not results:
                 logger.info("Strict DDG yielded no results. Relaxing domain filters...")
-                fallback_query = self.build_query(grade, subject, topic, subtopic, content_types, domains=None)
-                raw_fallback = self.fetch_ddg(fallback_query, max_results)
-                results = self.filter_results(raw_fallback, domains, blocked_domains, strict=strict_domain_filter)
+                fallback_query = self._build_query_band(grade, band, subject, topic, subtopic, content_types)
+                raw_fallback = await self.fetch_ddg_async(fallback_query, max_results)
+                results = self.filter_results(
+                    raw_fallback, domains, blocked_domains, strict=strict_domain_filter, limit=max_results,
+                )
 
         logger.info(
-            f"Search complete: {len(results)} results for "
-            f"Grade {grade} {subject} > {topic}"
+            "Search complete: %d results for Grade %s %s > %s",
+            len(results), grade, subject, topic,
         )
         return results
 
+    def search_many(
+        self,
+        specs: list[SearchSpec],
+        concurrency: int = 5,
+        **search_kwargs,
+    ) -> list[list[SearchResult] | BaseException]:
+        """Blocking wrapper around search_many_async(); sync-only like search()."""
+        return _run_sync(self.search_many_async(specs, concurrency, **search_kwargs), "search_many_async")
+
+    async def search_many_async(
+        self,
+        specs: list[SearchSpec],
+        concurrency: int = 5,
+        **search_kwargs,
+    ) -> list[list[SearchResult] | BaseException]:
+        """
+        Run several searches concurrently through one browser session.
+
+        At most `concurrency` searches are in flight at once (~5 keeps DDG
+        from rate-limiting). Bing fetches still serialize on the single
+        browser thread, which is started once and only closed after the
+        last spec. Results are returned in the same order as specs; a spec
+        whose search raised gets the exception in its slot instead.
+        search_kwargs (max_results, method, strict_domain_filter, ...)
+        apply to every spec.
+        """
+        logger.info("Starting batch search: %d queries (concurrency=%d)", len(specs), concurrency)
+        sem = asyncio.Semaphore(max(1, concurrency))
+
+        async def _one(spec: SearchSpec) -> list[SearchResult]:
+            async with sem:
+                return await self.search_async(**asdict(spec), **search_kwargs)
+
+        self._browser_session = True
+        try:
+            return await asyncio.gather(*(_one(spec) for spec in specs), return_exceptions=True)
+        finally:
+            self._browser_session = False
+            if self.searcher:
+                # Close on the thread that owns the browser
+                await self._run_in_browser_thread(self.searcher.close)
+
 
 # ═══════════════════════════════════════════════════════
 #  CLI
@@ -536,14 +1092,19 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(
         description="Educational Content Search via Bing (Firefox+Playwright)"
     )
-    parser.add_argument("--grade", type=int, required=True)
-    parser.add_argument("--subject", type=str, required=True)
-    parser.add_argument("--topic", type=str, required=True)
+    parser.add_argument("--grade", type=int)
+    parser.add_argument("--subject", type=str)
+    parser.add_argument("--topic", type=str)
     parser.add_argument("--subtopic", type=str, default=None)
     parser.add_argument(
         "--content-types", nargs="*", default=None,
         choices=list(CONTENT_TYPE_KEYWORDS.keys()),
     )
+    parser.add_argument(
+        "--batch", type=str, default=None,
+        help="JSON file with a list of {grade, subject, topic, ...} objects",
+    )
+    parser.add_argument("--concurrency", type=int, default=5)
     parser.add_argument("--max-results", type=int, default=10)
     parser.add_argument("--region", type=str, default="us-en")
     parser.add_argument("--strict", action="store_true")
@@ -554,33 +1115,55 @@ if __name__ == "__main__":
 
     args = parser.parse_args()
 
+    if args.batch:
+        with open(args.batch, encoding="utf-8") as f:
+            specs = [SearchSpec(**entry) for entry in json.load(f)]
+    elif args.grade is None or not args.subject or not args.topic:
+        parser.error("--grade, --subject and --topic are required unless --batch is given")
+    else:
+        specs = [SearchSpec(
+            grade=args.grade,
+            subject=args.subject,
+            topic=args.topic,
+            subtopic=args.subtopic,
+            content_types=args.content_types,
+        )]
+
     setup_logger(
         level=logging.DEBUG if args.debug else logging.INFO,
         log_file=args.log_file,
     )
 
-    pipeline = EduSearchPipeline()
-    results = pipeline.search(
-        grade=args.grade,
-        subject=args.subject,
-        topic=args.topic,
-        subtopic=args.subtopic,
-        content_types=args.content_types,
-        max_results=args.max_results,
-        region=args.region,
-        strict_domain_filter=args.strict,
-        method=args.method
-    )
+    with EduSearchPipeline() as pipeline:
+        common = dict(
+            max_results=args.max_results,
+            region=args.region,
+            strict_domain_filter=args.strict,
+            method=args.method,
+        )
+        if args.batch:
+            batch_results = pipeline.search_many(specs, args.concurrency, **common)
+        else:
+            batch_results = [pipeline.search(**asdict(specs[0]), **common)]
 
     if args.json:
-        print(json.dumps([r.to_dict() for r in results], indent=2))
+        payload = [
+            {"error": str(res)} if isinstance(res, BaseException) else [r.to_dict() for r in res]
+            for res in batch_results
+        ]
+        print(json.dumps(payload if args.batch else payload[0], indent=2))
     else:
-        print(f"\n{'=' * 60}")
-        print(f"Grade {args.grade} {args.subject} — {args.topic}")
-        print(f"{'=' * 60}")
-        for i, r in enumerate(results, 1):
-            trust = "✓" if r.is_trusted else "○"
-            print(f"\n  [{trust}] {i}. {r.title}")
-            print(f"      {r.url}")
-            if r.snippet:
-                print(f"      {r.snippet[:120]}...")
+        rule = "=" * 60
+        for spec, results in zip(specs, batch_results):
+            print(f"\n{rule}")
+            print(f"Grade {spec.grade} {spec.subject} — {spec.topic}")
+            print(rule)
+            if isinstance(results, BaseException):
+                print(f"\n  Search failed: {results}")
+                continue
+            for i, r in enumerate(results, 1):
+                trust = "✓" if r.is_trusted else "○"
+                print(f"\n  [{trust}] {i}. {r.title}")
+                print(f"      {r.url}")
+                if r.snippet:
+                    print(f"      {r.snippet[:120]}...")
@@ -7,29 +7,281 @@ Purpose:
   1. Primary: DuckDuckGo API (Fast, No Auth, High Quota)
   2. Fallback: Google Custom Search JSON API (Reliable, Auth Required)
 - Handles errors and logging gracefully.
+- Async end to end: Google result pages are fetched concurrently over one
+  httpx.AsyncClient; `search()` is a blocking shim for sync callers.
 """
 
 import os
+import json
+import time
+import atexit
+import asyncio
 import logging
-from typing import List, Optional
+import threading
+import weakref
+from collections import OrderedDict
+from itertools import islice
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import httpx
+
 try:
     from duckduckgo_search import DDGS
 except ImportError:
-    from ddgs import DDGS
-from googleapiclient.discovery import build
+    try:
+        from ddgs import DDGS
+    except ImportError:
+        DDGS = None
+
+# Rate limiting is the transient DDG failure worth retrying in place
+try:
+    from duckduckgo_search.exceptions import RatelimitException
+except ImportError:
+    try:
+        from ddgs.exceptions import RatelimitException
+    except ImportError:
+        RatelimitException = None
+
+# With h2 installed (httpx[http2]) all CSE pages share one multiplexed
+# connection; without it httpx falls back to pooled HTTP/1.1 keep-alive
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Google credentials, read once instead of per SearchManager(); callers that
+# change the environment afterwards (run.py, tests) call reload_env()
+_GOOGLE_KEY = os.getenv("GOOGLE_SEARCH_API_KEY")
+_GOOGLE_CX = os.getenv("GOOGLE_SEARCH_CX")
+
+# Called directly instead of through googleapiclient's discovery.build(),
+# which downloads the API discovery document on every call
+GOOGLE_CSE_URL = "https://www.googleapis.com/customsearch/v1"
+GOOGLE_PAGE_SIZE = 10    # CSE serves at most 10 results per request
+GOOGLE_MAX_RESULTS = 100  # ...and never past start=91
+GOOGLE_HTTP_LIMITS = httpx.Limits(max_connections=8, max_keepalive_connections=4)
+
+# Transient failures are retried inside each backend (delays 0.3s, 0.6s)
+# before auto mode gives up on it
+RETRY_ATTEMPTS = 3
+RETRY_BACKOFF_S = 0.3
+RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+# httpx.AsyncClient is tied to the loop it first ran on, so the pooled
+# client is kept per event loop and shared by every SearchManager on it
+_http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _http_client() -> httpx.AsyncClient:
+    """Pooled keep-alive client for the running loop, created on first use."""
+    loop = asyncio.get_running_loop()
+    client = _http_clients.get(loop)
+    if client is None or client.is_closed:
+        client = _http_clients[loop] = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE, limits=GOOGLE_HTTP_LIMITS,
+        )
+    return client
+
+
+async def close_http_client() -> None:
+    """Close the running loop's pooled client, if one was opened."""
+    client = _http_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+# ═══════════════════════════════════════════════════════
+#  RESULT CACHE
+# ═══════════════════════════════════════════════════════
+
+RESULT_CACHE_SIZE = 256
+RESULT_CACHE_TTL_S = 600
+RESULT_CACHE_FILE = Path("logs/search_cache.json")
+
+CacheKey = Tuple[str, str, int]
+
+
+class _ResultCache:
+    """
+    Thread-safe LRU of (backend, normalized query, max_results) -> URLs with
+    a per-entry TTL. Values are tuples so cached lists can't be mutated by
+    callers. Expiry uses wall-clock time so entries survive save()/load().
+    """
+
+    def __init__(self, maxsize: int, ttl_s: float):
+        self.maxsize = maxsize
+        self.ttl_s = ttl_s
+        self._data: "OrderedDict[CacheKey, Tuple[float, Tuple[str, ...]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def get(self, key: CacheKey) -> Optional[Tuple[str, ...]]:
+        self._ensure_loaded()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires, urls = entry
+            if expires <= time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return urls
+
+    def put(self, key: CacheKey, urls: List[str]) -> None:
+        with self._lock:
+            self._data[key] = (time.time() + self.ttl_s, tuple(urls))
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def save(self, path: Path) -> None:
+        """Write live entries to `path` for a warm start next run."""
+        now = time.time()
+        with self._lock:
+            rows = [
+                [list(key), expires, list(urls)]
+                for key, (expires, urls) in self._data.items() if expires > now
+            ]
+        if not rows:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(rows), encoding="utf-8")
+        except OSError as e:
+            logger.warning("SearchManager: Could not persist search cache: %s", e)
+
+    def load(self, path: Path) -> None:
+        """Merge unexpired entries from a previous save()."""
+        rows = self._read_rows(path)
+        with self._lock:
+            self._merge_locked(rows)
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        rows = self._read_rows(RESULT_CACHE_FILE)
+        with self._lock:
+            if not self._loaded:
+                self._merge_locked(rows)
+                self._loaded = True
+
+    @staticmethod
+    def _read_rows(path: Path) -> List[Tuple[CacheKey, float, Tuple[str, ...]]]:
+        """Parse a save() file, dropping rows that don't have its shape."""
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return []
+        if not isinstance(data, list):
+            return []
+        rows = []
+        for row in data:
+            try:
+                (backend, query, max_results), expires, urls = row
+            except (TypeError, ValueError):
+                continue
+            if not (
+                isinstance(backend, str) and isinstance(query, str)
+                and isinstance(max_results, int)
+                and isinstance(expires, (int, float))
+                and isinstance(urls, list) and all(isinstance(u, str) for u in urls)
+            ):
+                continue
+            rows.append(((backend, query, max_results), expires, tuple(urls)))
+        return rows
+
+    def _merge_locked(self, rows) -> None:
+        now = time.time()
+        for key, expires, urls in rows:
+            if expires > now:
+                self._data.setdefault(key, (expires, urls))
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+
+_result_cache = _ResultCache(RESULT_CACHE_SIZE, RESULT_CACHE_TTL_S)
+atexit.register(lambda: _result_cache.save(RESULT_CACHE_FILE))
+
+
 class SearchManager:
     """
     Manages search operations with automatic fallback strategies.
     """
 
-    def __init__(self):
-        self.google_api_key = os.getenv("GOOGLE_SEARCH_API_KEY")
-        self.google_cx = os.getenv("GOOGLE_SEARCH_CX")
+    def __init__(self, timeout: float = 15.0, hedge_delay_s: Optional[float] = None):
+        self.google_api_key = _GOOGLE_KEY
+        self.google_cx = _GOOGLE_CX
+        self.timeout = timeout
+        # auto mode: None (default) calls Google only once DDG has failed or
+        # come back empty. A number opts into hedging: Google also starts
+        # once DDG has been running that many seconds. Set it from DDG's
+        # measured p95 latency (seconds, not a few hundred ms), since every
+        # hedge that fires spends paid CSE quota even if DDG then wins
+        self.hedge_delay_s = hedge_delay_s
+
+    @classmethod
+    def reload_env(cls) -> None:
+        """Re-read the Google credentials for SearchManagers created from now on."""
+        global _GOOGLE_KEY, _GOOGLE_CX
+        _GOOGLE_KEY = os.getenv("GOOGLE_SEARCH_API_KEY")
+        _GOOGLE_CX = os.getenv("GOOGLE_SEARCH_CX")
+
+    @staticmethod
+    def cache_clear() -> None:
+        """Drop every cached search result (the on-disk copy is left as is)."""
+        _result_cache.clear()
+
+    async def _cached(self, backend: str, query: str, max_results: int, run) -> List[str]:
+        """
+        Serve (backend, query, max_results) from the in-process result cache,
+        calling `run()` on a miss. Empty results are not cached so a failed
+        or rate-limited search is retried next time.
+        """
+        key = (backend, " ".join(query.lower().split()), max_results)
+        urls = _result_cache.get(key)
+        if urls is not None:
+            logger.info("SearchManager: %s cache_hit=True (%d URLs)", backend, len(urls))
+            return list(urls)
+        results = await run()
+        if results:
+            _result_cache.put(key, results)
+        return results
+
+    async def _search_ddg_cached(self, query: str, max_results: int) -> List[str]:
+        return await self._cached(
+            "ddg", query, max_results,
+            lambda: asyncio.to_thread(self._search_ddg, query, max_results),
+        )
+
+    async def _search_google_cached(self, query: str, max_results: int) -> List[str]:
+        return await self._cached(
+            "google", query, max_results,
+            lambda: self._search_google_async(query, max_results),
+        )
 
     def search(self, query: str, max_results: int = 10, method: str = "auto") -> List[str]:
+        """Blocking wrapper around async_search() for sync callers."""
+        async def _run() -> List[str]:
+            try:
+                return await self.async_search(query, max_results, method)
+            finally:
+                # The loop dies with asyncio.run, so its pool goes with it
+                await close_http_client()
+
+        return asyncio.run(_run())
+
+    async def async_search(self, query: str, max_results: int = 10, method: str = "auto") -> List[str]:
         """
         Perform a search using the specified method or auto-fallback.
 
@@ -42,91 +294,178 @@ class SearchManager:
             List of discovered URLs.
         """
         method = method.lower()
-        logger.info(f"SearchManager: Requesting '{query}' (limit={max_results}, method={method})")
+        logger.info("SearchManager: Requesting '%s' (limit=%d, method=%s)", query, max_results, method)
 
         if method == "google":
-            return self._search_google(query, max_results)
+            return await self._search_google_cached(query, max_results)
         elif method == "ddg":
-            return self._search_ddg(query, max_results)
+            return await self._search_ddg_cached(query, max_results)
         else: # Auto
-            # Strategy: Try DDG first (free/fast), fallback to Google (paid/limited)
-            try:
-                results = self._search_ddg(query, max_results)
-                if results:
-                    return results
-                logger.warning("SearchManager: DDG returned no results. Falling back to Google.")
-            except Exception as e:
-                logger.error(f"SearchManager: DDG failed ({e}). Falling back to Google.")
+            if self.hedge_delay_s is not None:
+                return await self._search_hedged(query, max_results)
+            return await self._search_fallback(query, max_results)
+
+    async def _search_fallback(self, query: str, max_results: int) -> List[str]:
+        """
+        Strategy: DDG first (free/fast), Google (paid/limited) only if DDG
+        fails or finds nothing.
+        """
+        try:
+            results = await self._search_ddg_cached(query, max_results)
+            if results:
+                return results
+            logger.warning("SearchManager: DDG returned no results. Falling back to Google.")
+        except Exception as e:
+            logger.error("SearchManager: DDG failed (%s). Falling back to Google.", e)
 
-            # Fallback
-            return self._search_google(query, max_results)
+        return await self._search_google_cached(query, max_results)
+
+    async def _search_hedged(self, query: str, max_results: int) -> List[str]:
+        """
+        Opt-in variant of _search_fallback(): Google is also started once
+        DDG has run for hedge_delay_s, so a stalled DDG costs at most that
+        delay. The first non-empty answer wins and the other task is
+        cancelled, but CSE pages already requested still count against
+        the quota.
+        """
+        async def _google_after_delay() -> List[str]:
+            await asyncio.sleep(self.hedge_delay_s)
+            return await self._search_google_cached(query, max_results)
+
+        ddg_task = asyncio.create_task(self._search_ddg_cached(query, max_results))
+        google_task = asyncio.create_task(_google_after_delay())
+        pending = {ddg_task, google_task}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    try:
+                        results = task.result()
+                    except Exception as e:
+                        if task is ddg_task:
+                            logger.error("SearchManager: DDG failed (%s). Waiting on Google.", e)
+                        continue
+                    if results:
+                        return results
+                    if task is ddg_task:
+                        logger.warning("SearchManager: DDG returned no results. Waiting on Google.")
+            return []
+        finally:
+            for task in pending:
+                task.cancel()
 
     def _search_ddg(self, query: str, max_results: int) -> List[str]:
         """
         Search using DuckDuckGo (via ddgs package).
+        Blocking; async_search() runs it in a worker thread.
         """
+        if DDGS is None:
+            raise RuntimeError("DuckDuckGo search library (ddgs) is not installed.")
+
         try:
             logger.info("SearchManager: Executing DuckDuckGo search...")
-            urls = []
             with DDGS() as ddgs:
-                # ddgs.text returns an iterator of dicts {'title':..., 'href':..., 'body':...}
-                results = ddgs.text(query, max_results=max_results)
-                for r in results:
-                    urls.append(r['href'])
+                for attempt in range(RETRY_ATTEMPTS):
+                    try:
+                        seen = set()
+                        # ddgs.text returns an iterator of dicts {'title':..., 'href':..., 'body':...};
+                        # duplicates are dropped and the iterator is not read past max_results
+                        hrefs = (r.get('href') for r in ddgs.text(query, max_results=max_results))
+                        urls = list(islice(
+                            (u for u in hrefs if u and not (u in seen or seen.add(u))),
+                            max_results,
+                        ))
+                        break
+                    except Exception as e:
+                        if (RatelimitException is None or not isinstance(e, RatelimitException)
+                                or attempt == RETRY_ATTEMPTS - 1):
+                            raise
+                        delay = RETRY_BACKOFF_S * (2 ** attempt)
+                        logger.warning("SearchManager: DDG rate limited, retrying in %.1fs", delay)
+                        time.sleep(delay)
 
-            logger.info(f"SearchManager: DDG found {len(urls)} URLs")
+            logger.info("SearchManager: DDG found %d URLs", len(urls))
             return urls
         except Exception as e:
-            logger.error(f"SearchManager: DDG Error: {e}")
+            logger.error("SearchManager: DDG Error: %s", e)
             raise # Re-raise to trigger fallback in 'auto' mode
 
-    def _search_google(self, query: str, max_results: int) -> List[str]:
+    async def _get_with_retry(self, client: httpx.AsyncClient, params: dict) -> httpx.Response:
+        """GET one CSE page, retrying 429/5xx answers and transport errors."""
+        for attempt in range(RETRY_ATTEMPTS):
+            last = attempt == RETRY_ATTEMPTS - 1
+            try:
+                res = await client.get(GOOGLE_CSE_URL, timeout=self.timeout, params=params)
+            except httpx.TransportError as e:
+                if last:
+                    raise
+                reason = e
+            else:
+                if res.status_code not in RETRY_STATUSES or last:
+                    return res
+                reason = f"HTTP {res.status_code}"
+            delay = RETRY_BACKOFF_S * (2 ** attempt)
+            logger.warning("SearchManager: Google page start=%s failed (%s), retrying in %.1fs",
+                           params.get("start"), reason, delay)
+            await asyncio.sleep(delay)
+
+    async def _search_google_async(self, query: str, max_results: int) -> List[str]:
         """
         Search using Google Custom Search JSON API.
+        Every result page is requested at once, so max_results=50 costs one
+        round-trip of wall time instead of five sequential ones, over a
+        keep-alive connection pool reused across searches on the same loop.
         """
         if not self.google_api_key or not self.google_cx:
             logger.warning("SearchManager: Google API credentials missing (GOOGLE_SEARCH_API_KEY, GOOGLE_SEARCH_CX). Skipping Google search.")
             return []
 
-        try:
-            logger.info("SearchManager: Executing Google Custom Search...")
-            service = build("customsearch", "v1", developerKey=self.google_api_key)
+        limit = min(max_results, GOOGLE_MAX_RESULTS)
+        starts = range(1, limit + 1, GOOGLE_PAGE_SIZE)
+        base_params = {"key": self.google_api_key, "cx": self.google_cx, "q": query}
 
-            # CSE allows max 10 results per page
-            # If max_results > 10, we'd need pagination.
-            # For this scope, let's cap at 10 per call or loop if needed.
-            # Usually discovery is fine with top 10.
+        try:
+            logger.info("SearchManager: Executing Google Custom Search (%d pages)...", len(starts))
+            client = _http_client()
+            responses = await asyncio.gather(
+                *(
+                    self._get_with_retry(client, {
+                        **base_params,
+                        "start": start,
+                        "num": min(GOOGLE_PAGE_SIZE, limit - start + 1),
+                    })
+                    for start in starts
+                ),
+                return_exceptions=True,
+            )
 
             urls = []
-            start_index = 1
-
-            while len(urls) < max_results:
-                # Calculate how many to fetch (max 10)
-                num = min(10, max_results - len(urls))
-
-                res = service.cse().list(
-                    q=query,
-                    cx=self.google_cx,
-                    num=num,
-                    start=start_index
-                ).execute()
-
-                items = res.get('items', [])
+            # Pages are consumed in order and the first failed or empty page
+            # ends the list, as the old sequential pagination did
+            for page, res in enumerate(responses):
+                try:
+                    if isinstance(res, Exception):
+                        raise res
+                    res.raise_for_status()
+                except Exception as e:
+                    if page == 0:
+                        raise
+                    logger.warning("SearchManager: Google page %d failed: %s", page + 1, e)
+                    break
+                data = res.json()
+                items = data.get('items', [])
                 if not items:
                     break
-
-                for item in items:
-                    urls.append(item['link'])
-
-                start_index += len(items)
-
-                # Check for next page
-                if 'nextPage' not in res.get('queries', {}):
+                urls.extend(item['link'] for item in items)
+                # Last page of the result set: later pages (fetched
+                # speculatively) can only repeat or pad it
+                if 'nextPage' not in data.get('queries', {}):
                     break
 
-            logger.info(f"SearchManager: Google found {len(urls)} URLs")
+            urls = urls[:max_results]
+            logger.info("SearchManager: Google found %d URLs", len(urls))
             return urls
 
         except Exception as e:
-            logger.error(f"SearchManager: Google Search Error: {e}")
+            logger.error("SearchManager: Google Search Error: %s", e)
             return [] # Return empty list on Google failure (it's usually the fallback)
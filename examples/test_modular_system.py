@@ -9,7 +9,10 @@ Usage:
 """
 
 import asyncio
+import functools
+import json
 import os
+import weakref
 import sys
 import logging
 from pathlib import Path
@@ -30,6 +33,37 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Read once; main() overrides it when --mode is given
+GUIDED_MODE = os.getenv("NOTEBOOKLM_GUIDED", "false").lower() == "true"
+
+
+@functools.lru_cache(maxsize=32)
+def _make_orchestrator(request_sig: str) -> PromptOrchestrator:
+    """One PromptOrchestrator per distinct request (keyed by its JSON dump)."""
+    return PromptOrchestrator(json.loads(request_sig))
+
+
+def get_orchestrator(content_request: ContentRequest) -> PromptOrchestrator:
+    return _make_orchestrator(content_request.model_dump_json())
+
+
+# The prompt builders only read orchestrator state, so each orchestrator's
+# prompts are built once and dropped with it
+_prompt_cache = weakref.WeakKeyDictionary()
+
+
+def build_prompts(prompt_orchestrator: PromptOrchestrator, content_request: ContentRequest) -> tuple:
+    """(quiz, study guide, handout) prompts for content_request."""
+    prompts = _prompt_cache.get(prompt_orchestrator)
+    if prompts is None:
+        prompts = (
+            prompt_orchestrator.build_quiz_prompt(content_request),
+            prompt_orchestrator.build_study_guide_prompt(content_request),
+            prompt_orchestrator.build_handout_prompt(content_request),
+        )
+        _prompt_cache[prompt_orchestrator] = prompts
+    return prompts
+
 
 def test_prompt_generation():
     """
@@ -60,10 +94,10 @@ def test_prompt_generation():
         purpose="Clarify concept: mass vs weight, improve assertion reasoning",
         multi_report_types=["student", "teacher"],
         keywords_report="force of attraction, microgravity, orbital mechanics",
-        source_type=SourceType.trusted
+        source_type=SourceType.TRUSTED
     )
 
-    logger.info(f"Content Request: {content_request.grade} {content_request.topic}")
+    logger.info("Content Request: %s %s", content_request.grade, content_request.topic)
 
     # Test Module A: Input Source Prompts (GUIDED MODE)
     logger.info("\n--- Module A: Input Source Prompt Generation ---")
@@ -78,43 +112,41 @@ def test_prompt_generation():
 
     search_strategy = input_builder.generate_multi_source_strategy()
 
-    logger.info(f"Primary Search Query: {search_strategy['primary_search'][:100]}...")
-    logger.info(f"Conceptual Search: {search_strategy['conceptual_search'][:100]}...")
-    logger.info(f"Source Weighting: {search_strategy.get('source_weighting', {})}")
+    logger.info("Primary Search Query: %.100s...", search_strategy['primary_search'])
+    logger.info("Conceptual Search: %.100s...", search_strategy['conceptual_search'])
+    logger.info("Source Weighting: %s", search_strategy.get('source_weighting', {}))
 
     # Test Module B + C + D: Output Prompts
     logger.info("\n--- Module B/C/D: Output Prompt Generation ---")
 
-    prompt_orchestrator = PromptOrchestrator(content_request.model_dump())
+    prompt_orchestrator = get_orchestrator(content_request)
+    quiz_prompt, guide_prompt, handout_prompt = build_prompts(prompt_orchestrator, content_request)
 
     # Generate quiz prompt
-    quiz_prompt = prompt_orchestrator.build_quiz_prompt(content_request)
-    logger.info(f"Quiz Prompt Length: {len(quiz_prompt)} chars")
-    logger.info(f"Quiz Prompt Preview:\n{quiz_prompt[:300]}...\n")
+    logger.info("Quiz Prompt Length: %d chars", len(quiz_prompt))
+    logger.info("Quiz Prompt Preview:\n%.300s...\n", quiz_prompt)
 
     # Generate study guide prompt
-    guide_prompt = prompt_orchestrator.build_study_guide_prompt(content_request)
-    logger.info(f"Study Guide Prompt Length: {len(guide_prompt)} chars")
-    logger.info(f"Study Guide Preview:\n{guide_prompt[:300]}...\n")
+    logger.info("Study Guide Prompt Length: %d chars", len(guide_prompt))
+    logger.info("Study Guide Preview:\n%.300s...\n", guide_prompt)
 
     # Generate handout prompt
-    handout_prompt = prompt_orchestrator.build_handout_prompt(content_request)
-    logger.info(f"Handout Prompt Length: {len(handout_prompt)} chars")
-    logger.info(f"Handout Preview:\n{handout_prompt[:300]}...\n")
+    logger.info("Handout Prompt Length: %d chars", len(handout_prompt))
+    logger.info("Handout Preview:\n%.300s...\n", handout_prompt)
 
     # Validate prompts
     logger.info("\n--- Prompt Validation ---")
     is_valid, issues = prompt_orchestrator.validate_prompt(quiz_prompt, 'quiz')
-    logger.info(f"Quiz Prompt Valid: {is_valid}")
+    logger.info("Quiz Prompt Valid: %s", is_valid)
     if issues:
-        logger.warning(f"Issues: {issues}")
+        logger.warning("Issues: %s", issues)
 
     logger.info("\n✓ TEST 1 COMPLETE: All prompt modules working correctly\n")
 
     return content_request, prompt_orchestrator
 
 
-def test_format_conversion():
+async def test_format_conversion():
     """
     Test Phase 4: Format conversion (CSV → Excel, Markdown → PDF/HTML).
     """
@@ -169,27 +201,29 @@ Where:
     # Initialize converter
     converter = FormatConverter(output_dir="outputs/test")
 
+    # The three conversions write separate files, so run them side by side
+    logger.info("\n--- Converting CSV to Excel, Markdown to HTML and PDF ---")
+    excel_path, html_path, pdf_path = await asyncio.gather(
+        asyncio.to_thread(converter.csv_to_excel, sample_csv, "test_quiz"),
+        asyncio.to_thread(converter.markdown_to_html, sample_markdown, "test_study_guide"),
+        asyncio.to_thread(converter.markdown_to_pdf, sample_markdown, "test_study_guide"),
+    )
+
     # Test CSV → Excel
-    logger.info("\n--- Converting CSV to Excel ---")
-    excel_path = converter.csv_to_excel(sample_csv, "test_quiz")
     if excel_path:
-        logger.info(f"✓ Excel file created: {excel_path}")
+        logger.info("✓ Excel file created: %s", excel_path)
     else:
         logger.warning("Excel conversion failed (openpyxl may not be installed)")
 
     # Test Markdown → HTML
-    logger.info("\n--- Converting Markdown to HTML ---")
-    html_path = converter.markdown_to_html(sample_markdown, "test_study_guide")
     if html_path:
-        logger.info(f"✓ HTML file created: {html_path}")
+        logger.info("✓ HTML file created: %s", html_path)
     else:
         logger.warning("HTML conversion failed")
 
     # Test Markdown → PDF
-    logger.info("\n--- Converting Markdown to PDF ---")
-    pdf_path = converter.markdown_to_pdf(sample_markdown, "test_study_guide")
     if pdf_path:
-        logger.info(f"✓ PDF file created: {pdf_path}")
+        logger.info("✓ PDF file created: %s", pdf_path)
     else:
         logger.warning("PDF conversion failed (pdfkit/weasyprint may not be installed)")
 
@@ -201,15 +235,16 @@ Where:
         'visuals_md': sample_markdown
     }
 
-    all_files = converter.convert_notebooklm_artifacts(
+    all_files = await asyncio.to_thread(
+        converter.convert_notebooklm_artifacts,
         artifacts=artifacts,
         base_name="grade8_gravity",
         output_formats=['excel', 'html', 'pdf']
     )
 
-    logger.info(f"✓ Batch conversion complete: {len(all_files)} files created")
+    logger.info("✓ Batch conversion complete: %d files created", len(all_files))
     for format_type, path in all_files.items():
-        logger.info(f"  - {format_type}: {path}")
+        logger.info("  - %s: %s", format_type, path)
 
     logger.info("\n✓ TEST 2 COMPLETE: Format conversion working\n")
 
@@ -244,14 +279,14 @@ async def test_full_workflow_simulation():
         purpose="Clarify concept: mass vs weight",
         multi_report_types=["student"],
         keywords_report="force of attraction, microgravity",
-        source_type=SourceType.trusted,
+        source_type=SourceType.TRUSTED,
         target_url=None  # Will trigger search in guided mode
     )
 
     # Simulate guided mode workflow
-    guided_mode = os.getenv("NOTEBOOKLM_GUIDED", "false").lower() == "true"
+    guided_mode = GUIDED_MODE
 
-    logger.info(f"Mode: {'GUIDED' if guided_mode else 'UNGUIDED'}")
+    logger.info("Mode: %s", 'GUIDED' if guided_mode else 'UNGUIDED')
 
     # PHASE 1: Input Source Handling
     if guided_mode:
@@ -266,7 +301,7 @@ async def test_full_workflow_simulation():
         )
 
         search_strategy = input_builder.generate_multi_source_strategy()
-        logger.info(f"Would inject search query: {search_strategy['primary_search'][:80]}...")
+        logger.info("Would inject search query: %.80s...", search_strategy['primary_search'])
         logger.info("(In real workflow: InputSourcePromptInjector.inject_source_discovery_prompts())")
     else:
         logger.info("\n--- PHASE 1: Direct Upload (UNGUIDED) ---")
@@ -275,11 +310,8 @@ async def test_full_workflow_simulation():
     # PHASE 2: Output Prompt Generation
     logger.info("\n--- PHASE 2: Output Prompt Generation ---")
 
-    prompt_orchestrator = PromptOrchestrator(content_request.model_dump())
-
-    quiz_prompt = prompt_orchestrator.build_quiz_prompt(content_request)
-    guide_prompt = prompt_orchestrator.build_study_guide_prompt(content_request)
-    handout_prompt = prompt_orchestrator.build_handout_prompt(content_request)
+    prompt_orchestrator = get_orchestrator(content_request)
+    quiz_prompt, guide_prompt, handout_prompt = build_prompts(prompt_orchestrator, content_request)
 
     logger.info(f"Generated 3 prompts: quiz ({len(quiz_prompt)} chars), "
                f"guide ({len(guide_prompt)} chars), handout ({len(handout_prompt)} chars)")
@@ -296,7 +328,7 @@ async def test_full_workflow_simulation():
         'visuals_md': """## Newton's Law\n\n$$F = G \\frac{m_1 m_2}{r^2}$$"""
     }
 
-    logger.info(f"Mock results: {list(mock_results.keys())}")
+    logger.info("Mock results: %s", list(mock_results.keys()))
 
     # PHASE 4: Format Conversion
     logger.info("\n--- PHASE 4: Format Conversion ---")
@@ -308,9 +340,9 @@ async def test_full_workflow_simulation():
         output_formats=content_request.output_formats
     )
 
-    logger.info(f"✓ Converted to {len(converted_files)} formats:")
+    logger.info("✓ Converted to %d formats:", len(converted_files))
     for fmt, path in converted_files.items():
-        logger.info(f"  - {fmt}: {path}")
+        logger.info("  - %s: %s", fmt, path)
 
     logger.info("\n✓ TEST 3 COMPLETE: Full workflow simulation successful\n")
 
@@ -367,8 +399,10 @@ def main():
     args = parser.parse_args()
 
     if args.mode:
-        os.environ['NOTEBOOKLM_GUIDED'] = 'true' if args.mode == 'guided' else 'false'
-        logger.info(f"Set NOTEBOOKLM_GUIDED={os.environ['NOTEBOOKLM_GUIDED']}")
+        global GUIDED_MODE
+        GUIDED_MODE = args.mode == 'guided'
+        os.environ['NOTEBOOKLM_GUIDED'] = 'true' if GUIDED_MODE else 'false'
+        logger.info("Set NOTEBOOKLM_GUIDED=%s", os.environ['NOTEBOOKLM_GUIDED'])
 
     if args.examples:
         print_usage_examples()
@@ -381,7 +415,7 @@ def main():
 
         # Test 2: Format Conversion
         logger.info("Running Test 2: Format Conversion...")
-        test_format_conversion()
+        asyncio.run(test_format_conversion())
 
         # Test 3: Full Workflow Simulation
         logger.info("Running Test 3: Full Workflow Simulation...")
@@ -1,79 +1,237 @@
 import logging
-from bs4 import BeautifulSoup
+import re
+from lxml import etree
 from contracts.extraction_schema import ExtractedDocument
 
+# Fast path: selectolax's lexbor backend parses and selects in C; the
+# streaming lxml parser below is the fallback when it isn't installed
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
 logger = logging.getLogger(__name__)
 
+_CONTENT_TAGS = ("h1", "h2", "h3", "h4", "h5", "h6", "p", "li", "table")
+_CONTENT_TAG_SET = frozenset(_CONTENT_TAGS)
+_HEADING_TAGS = frozenset(("h1", "h2", "h3", "h4", "h5", "h6"))
+# Elements whose text is never page content, even inside a content tag
+_NON_TEXT_TAGS = frozenset(("script", "style", "noscript"))
+# lexbor parses as if scripting were off, so a <noscript> in <head> ends at
+# the first body tag and its markup leaks into the page. Cut noscript
+# blocks out of the source instead, reading them as raw text up to the
+# closing tag the way a scripting browser does
+_NOSCRIPT_RE = re.compile(r"<noscript\b.*?(?:</noscript\s*>|\Z)", re.IGNORECASE | re.DOTALL)
+# Common content containers (article, main, div#content, div.post-content,
+# div.article-content); the first one in document order wins
+_CONTAINER_TAGS = frozenset(("article", "main"))
+_CONTAINER_DIV_CLASSES = frozenset(("post-content", "article-content"))
+# The lxml fallback is fed in chunks of this many bytes
+_FEED_CHUNK = 64 * 1024
+
+# Same queries as CSS for the lexbor fast path
+_CSS_OG_TITLE = 'meta[property="og:title"]'
+_CSS_MAIN_CONTAINER = "article, main, div#content, div.post-content, div.article-content"
+_CSS_CONTENT_TAGS = ", ".join(_CONTENT_TAGS)
+
+# Titles too generic to describe the page; the first <h1> is used instead
+_GENERIC_TITLES = frozenset(("untitled", "document", "page", "home", "index"))
+
+
+def _text(pieces) -> str:
+    """Text nodes joined by single spaces, like bs4's get_text(" ", strip=True)."""
+    return " ".join(" ".join(pieces).split())
+
+
+def _heading_text(pieces) -> str:
+    """Stripped text nodes run together, like bs4's get_text(strip=True)."""
+    return "".join(s.strip() for s in pieces)
+
+
+def _is_container(tag: str, attrib) -> bool:
+    if tag in _CONTAINER_TAGS:
+        return True
+    if tag != "div":
+        return False
+    return attrib.get("id") == "content" or not _CONTAINER_DIV_CLASSES.isdisjoint(
+        attrib.get("class", "").split()
+    )
+
+
+class _SectionTarget:
+    """
+    lxml parser target that records what extract() needs while the page
+    streams through the parser, so no tree is ever built: only the text of
+    the content tags is kept. close() returns the same tuple as
+    _scan_lexbor(). Each content element's text is a list of its text
+    nodes; nested elements (a <p> inside an <li>) are recorded in both, in
+    start-tag order, as a DOM walk would. Text and content tags inside
+    script/style/noscript are dropped.
+    """
+
+    def __init__(self):
+        self.og_title = None
+        self.title = None
+        self.first_h1 = None
+        self.all_items = []
+        self.main_items = None      # set when the first container opens
+        self.container_depth = 0    # depth of that container, 0 once closed
+        self.depth = 0
+        self.open_items = []        # content elements currently open
+        self.in_title = False
+        self.after_data = False     # consecutive data() calls extend one text node
+        self.skip_depth = 0         # open script/style/noscript elements
+
+    def start(self, tag, attrib):
+        self.depth += 1
+        self.after_data = False
+        self.in_title = False
+        if tag in _NON_TEXT_TAGS:
+            self.skip_depth += 1
+        if tag == "meta":
+            if self.og_title is None and attrib.get("property") == "og:title":
+                self.og_title = attrib.get("content", "")
+        elif tag == "title" and self.title is None:
+            self.title = []
+            self.in_title = True
+        if self.main_items is None and _is_container(tag, attrib):
+            self.main_items = []
+            self.container_depth = self.depth
+        if tag in _CONTENT_TAG_SET and not self.skip_depth:
+            item = (tag, [])
+            self.all_items.append(item)
+            if self.container_depth:
+                self.main_items.append(item)
+            if tag == "h1" and self.first_h1 is None:
+                self.first_h1 = item
+            self.open_items.append(item)
+
+    def end(self, tag):
+        self.after_data = False
+        self.in_title = False
+        if tag in _NON_TEXT_TAGS and self.skip_depth:
+            self.skip_depth -= 1
+        if tag in _CONTENT_TAG_SET and self.open_items and not self.skip_depth:
+            self.open_items.pop()
+        if self.depth == self.container_depth:
+            self.container_depth = 0
+        self.depth -= 1
+
+    def data(self, text):
+        if self.skip_depth:
+            return
+        if self.after_data:
+            for _, pieces in self.open_items:
+                pieces[-1] += text
+        else:
+            for _, pieces in self.open_items:
+                pieces.append(text)
+        if self.in_title:
+            self.title.append(text)
+        self.after_data = True
+
+    def comment(self, text):
+        # Comments split text nodes but contribute no text
+        self.after_data = False
+
+    def close(self):
+        items = self.main_items if self.main_items is not None else self.all_items
+        return (
+            self.og_title or "",
+            "".join(self.title or ()),
+            _heading_text(self.first_h1[1]) if self.first_h1 else "",
+            [
+                (tag, _heading_text(pieces) if tag in _HEADING_TAGS else _text(pieces))
+                for tag, pieces in items
+            ],
+        )
+
+
+def _scan_lxml(html: str):
+    """
+    (og:title, <title>, first <h1>, [(tag, text), ...]) by streaming the
+    page through lxml's HTML parser into a _SectionTarget.
+    """
+    parser = etree.HTMLParser(target=_SectionTarget(), encoding="utf-8")
+    data = html.encode("utf-8", "replace")
+    try:
+        for offset in range(0, len(data), _FEED_CHUNK):
+            parser.feed(data[offset:offset + _FEED_CHUNK])
+        return parser.close()
+    except etree.XMLSyntaxError:
+        # Empty or whitespace-only page
+        return "", "", "", []
+
+
+def _scan_lexbor(html: str):
+    """Same result as _scan_lxml() using selectolax's lexbor parser."""
+    tree = LexborHTMLParser(_NOSCRIPT_RE.sub("", html))
+    # node.text() would include script/style bodies; drop those elements first
+    tree.strip_tags(list(_NON_TEXT_TAGS), recursive=True)
+
+    og_node = tree.css_first(_CSS_OG_TITLE)
+    title_node = tree.css_first("title")
+    h1 = tree.css_first("h1")
+
+    main_content = tree.css_first(_CSS_MAIN_CONTAINER) or tree.body or tree.root
+    if main_content is None:
+        return "", "", "", []
+
+    items = [
+        (
+            item.tag,
+            item.text(strip=True) if item.tag in _HEADING_TAGS
+            else " ".join(item.text(deep=True, separator=" ", strip=True).split()),
+        )
+        for item in main_content.css(_CSS_CONTENT_TAGS)
+    ]
+    return (
+        (og_node.attributes.get("content") or "") if og_node else "",
+        title_node.text() if title_node else "",
+        h1.text(strip=True) if h1 else "",
+        items,
+    )
+
+
 def extract(html: str, url: str) -> ExtractedDocument:
-    logger.info(f"Starting Robust HTML extraction for {url}")
+    logger.info("Starting Robust HTML extraction for %s", url)
+
+    scan = _scan_lexbor if LexborHTMLParser is not None else _scan_lxml
+    og_title, page_title, h1_title, items = scan(html)
 
-    soup = BeautifulSoup(html, "html.parser")
-    
     # Robust title extraction
-    title = ""
-    # 1. Try OG Title
-    og_title = soup.find("meta", property="og:title")
-    if og_title and og_title.get("content"):
-        title = og_title["content"].strip()
-        
-    # 2. Try standard title
-    if not title and soup.title and soup.title.string:
-        title = soup.title.string.strip()
-    
+    # 1. Try OG Title, 2. standard title
+    title = og_title.strip() or page_title.strip()
+
     # 3. Fallback to H1
-    generic_titles = ["untitled", "document", "page", "home", "index"]
-    if not title or title.lower() in generic_titles:
-        h1 = soup.find("h1")
-        if h1:
-            title = h1.get_text(strip=True)
-            
+    if (not title or title.lower() in _GENERIC_TITLES) and h1_title:
+        title = h1_title
+
     if not title:
         title = "Untitled Artifact"
 
-    # 1. Identify "Main" container (Heuristic-based)
-    # We look for common content containers
-    main_content = soup.find(["article", "main", "div#content", "div.post-content", "div.article-content"])
-    if not main_content:
-        # Fallback to body if no obvious main container found
-        main_content = soup.body if soup.body else soup
-
     sections = []
-    
+
     # Standardize content: extract text from headers, paragraphs, lists, and tables
-    # We navigate through children of the main container
-    
-    current_section = {"heading": "General", "content": []}
-    
-    # Select all potential content-bearing Tags
-    items = main_content.find_all(["h1", "h2", "h3", "h4", "h5", "h6", "p", "li", "table"])
-    
-    for item in items:
+    # We walk the main container's content tags in document order, keeping
+    # the open section in two locals and joining its parts once on flush
+
+    heading, parts = "General", []
+
+    for tag, text in items:
         # If it's a header, it starts a new section
-        if item.name.startswith("h"):
+        if tag in _HEADING_TAGS:
             # Save previous section if it has content
-            if current_section["content"]:
-                sections.append({
-                    "heading": current_section["heading"],
-                    "content": " ".join(current_section["content"])
-                })
-            
-            # Start new section
-            current_section = {
-                "heading": item.get_text(strip=True),
-                "content": []
-            }
-        else:
+            if parts:
+                sections.append({"heading": heading, "content": " ".join(parts)})
+            heading, parts = text, []
+        elif text:
             # It's content (p, li, table)
-            text = item.get_text(" ", strip=True)
-            if text:
-                current_section["content"].append(text)
+            parts.append(text)
 
     # Final section
-    if current_section["content"]:
-        sections.append({
-            "heading": current_section["heading"],
-            "content": " ".join(current_section["content"])
-        })
+    if parts:
+        sections.append({"heading": heading, "content": " ".join(parts)})
 
     doc = ExtractedDocument(
         title=title,
@@ -81,5 +239,5 @@ def extract(html: str, url: str) -> ExtractedDocument:
         source_url=url
     )
 
-    logger.info(f"Robustly extracted {len(sections)} sections from document: {title}")
+    logger.info("Robustly extracted %d sections from document: %s", len(sections), title)
     return doc
@@ -2,16 +2,30 @@ import logging
 import os
 import sys
 import json
+import copy
+import queue
+import atexit
 from datetime import datetime
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+
+# orjson serializes log records several times faster than json.dumps and
+# formats datetimes natively; stdlib json remains the fallback
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Background thread that owns the real handlers (see setup_logging)
+_listener = None
 
 class JSONFormatter(logging.Formatter):
     """
     Formatter that outputs JSON strings with structured data.
     """
     def format(self, record):
+        timestamp = datetime.fromtimestamp(record.created)
         log_record = {
-            "timestamp": datetime.fromtimestamp(record.created).isoformat(),
+            "timestamp": timestamp if orjson else timestamp.isoformat(),
             "level": record.levelname,
             "name": record.name,
             "message": record.getMessage(),
@@ -28,13 +42,45 @@ class JSONFormatter(logging.Formatter):
         if record.exc_info:
             log_record["exception"] = self.formatException(record.exc_info)
 
+        if orjson:
+            return orjson.dumps(log_record).decode()
         return json.dumps(log_record)
 
+# Formatters are stateless, so one of each is built at import and shared by
+# every setup_logging() call
+_JSON_FORMATTER = JSONFormatter()
+_CONSOLE_FORMATTER = logging.Formatter("%(asctime)s | %(levelname)s | %(name)s | %(message)s")
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler that only resolves the message on the caller's thread.
+    The stock prepare() renders the full formatted line (and traceback)
+    before enqueueing; here exc_info is kept so JSONFormatter can still
+    emit it as a separate "exception" field on the listener thread.
+    """
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def _stop_listener():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
 def setup_logging():
     """
     Configures the logging for the application.
     RULE: Each pipeline stage MUST log: start, success, failure (with exception).
     No stage may fail silently.
+
+    Callers only enqueue records; a QueueListener thread does the JSON
+    formatting and file/console I/O, so log calls in hot loops don't block
+    on disk writes.
     """
     log_dir = "logs"
     if not os.path.exists(log_dir):
@@ -44,7 +90,8 @@ def setup_logging():
     root_logger = logging.getLogger()
     root_logger.setLevel(logging.INFO)
 
-    # Clear existing handlers to avoid duplicates
+    # Clear existing handlers (and a previous listener) to avoid duplicates
+    _stop_listener()
     if root_logger.handlers:
         root_logger.handlers = []
 
@@ -53,15 +100,23 @@ def setup_logging():
     file_handler = RotatingFileHandler(
         os.path.join(log_dir, "app.log"),
         maxBytes=10*1024*1024,
-        backupCount=5
+        backupCount=5,
+        encoding="utf-8",
     )
     file_handler.setLevel(logging.INFO)
-    file_handler.setFormatter(JSONFormatter())
-    root_logger.addHandler(file_handler)
+    file_handler.setFormatter(_JSON_FORMATTER)
 
     # Console Handler (Human Readable)
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.INFO)
-    console_formatter = logging.Formatter("%(asctime)s | %(levelname)s | %(name)s | %(message)s")
-    console_handler.setFormatter(console_formatter)
-    root_logger.addHandler(console_handler)
+    console_handler.setFormatter(_CONSOLE_FORMATTER)
+
+    # The queue handler is the only one callers see
+    global _listener
+    log_queue = queue.SimpleQueue()
+    root_logger.addHandler(_DeferredQueueHandler(log_queue))
+    _listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    _listener.start()
+
+
+atexit.register(_stop_listener)
@@ -1,7 +1,13 @@
 from playwright.sync_api import sync_playwright
-import time
 import json
 
+# Kept between runs so Chromium starts from a warm profile (disk cache,
+# cookies, local storage) instead of a fresh one
+PROFILE_DIR = ".pw-profile"
+# Let the progress bar / tab transition finish animating before a capture
+SETTLE_MS = 500
+TOPIC_INPUT = "input[placeholder='Enter main topic...']"
+
 def handle_execute(route):
     route.fulfill(
         status=200,
@@ -41,14 +47,18 @@ def handle_logs_completed(route):
 
 def run_mock():
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
         # PC Browser Optimization: 1920x1080
-        context = browser.new_context(viewport={"width": 1920, "height": 1080})
-        page = context.new_page()
+        context = p.chromium.launch_persistent_context(
+            user_data_dir=PROFILE_DIR,
+            headless=True,
+            viewport={"width": 1920, "height": 1080},
+        )
+        page = context.pages[0] if context.pages else context.new_page()
 
         # 1. Screen 1: Input Setup
         page.goto("http://localhost:5173")
-        time.sleep(2) # Wait for hydration
+        # Wait for hydration
+        page.wait_for_selector(TOPIC_INPUT, state="visible")
 
         # Fill Data
 
@@ -58,7 +68,7 @@ def run_mock():
         page.locator(".bg-slate-800").filter(has_text="Search Web").locator("button").click()
 
         # Topic
-        page.fill("input[placeholder='Enter main topic...']", "Quantum Physics")
+        page.fill(TOPIC_INPUT, "Quantum Physics")
 
         # Select Grade 9
         page.select_option("select", "9")
@@ -72,7 +82,7 @@ def run_mock():
         # Select Difficulty 'Extend'
         page.click("div:has-text('Extend')")
 
-        time.sleep(1) # Visual settle
+        page.wait_for_timeout(SETTLE_MS) # Visual settle
         page.screenshot(path="verification/mock_run_1_input.png")
         print("Screen 1: Input captured.")
 
@@ -81,10 +91,10 @@ def run_mock():
         page.route("**/api/auto/execute", handle_execute)
         page.route("**/api/logs", handle_logs_running)
 
-        # Click Launch
+        # Click Launch, then wait for the RUNNING logs to render
         page.click("button:has-text('LAUNCH RESEARCH PIPELINE')")
-
-        time.sleep(3) # Wait for progress bar to animate and logs to appear
+        page.wait_for_selector("text=Initiating mission protocol", timeout=5000)
+        page.wait_for_timeout(SETTLE_MS)
         page.screenshot(path="verification/mock_run_2_running.png")
         print("Screen 2: Running captured.")
 
@@ -93,16 +103,17 @@ def run_mock():
         page.unroute("**/api/logs")
         page.route("**/api/logs", handle_logs_completed)
 
-        time.sleep(3) # Wait for polling to pick up COMPLETED status
+        # Wait for polling to pick up COMPLETED status
+        page.wait_for_selector("text=Mission Complete")
 
         # Switch to Output Tab
         page.click("button:has-text('OUTPUT (Synthesis)')")
 
-        time.sleep(1)
+        page.wait_for_timeout(SETTLE_MS)
         page.screenshot(path="verification/mock_run_3_output.png")
         print("Screen 3: Output captured.")
 
-        browser.close()
+        context.close()
 
 if __name__ == "__main__":
     run_mock()
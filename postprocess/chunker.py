@@ -1,9 +1,17 @@
 import logging
-from typing import List
+from functools import lru_cache
+from typing import Callable, List, Optional
 from contracts.chunk_schema import Chunk
 from contracts.extraction_schema import ExtractedSection
 import os
 
+# Aho-Corasick matches every keyword in one pass over a section; without
+# pyahocorasick each keyword is a str `in` test (see _keyword_matcher)
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 logger = logging.getLogger(__name__)
 
 # Load MAX_TOKENS from env, default to 1200
@@ -16,66 +24,143 @@ def estimate_tokens(text: str) -> int:
     """
     return len(text) // 4
 
+@lru_cache(maxsize=2048)
+def _haystack(heading: str, content: str) -> str:
+    """
+    Case-folded text a section is matched against. Cached so re-chunking the
+    same sections (other strategy or keyword set) doesn't case-fold them again.
+    casefold() rather than lower() so e.g. "Straße" matches "STRASSE".
+    """
+    return (heading + " " + content).casefold()
+
+def _keyword_matcher(keywords: List[str]) -> Callable[[str], Optional[str]]:
+    """
+    Returns a function giving the (case-folded) keyword found earliest in a
+    case-folded text, or None. Keywords starting at the same position go to
+    the one listed first. Both backends follow this rule, so the reported
+    match doesn't depend on whether pyahocorasick is installed.
+    """
+    unique = tuple(dict.fromkeys(keywords))
+
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for i, k in enumerate(unique):
+            automaton.add_word(k, (i, k))
+        automaton.make_automaton()
+        longest = max(map(len, unique))
+
+        def first_match(text: str) -> Optional[str]:
+            best = None  # (start, list index, keyword)
+            # Matches arrive in order of end position; once a match ends
+            # `longest` characters past the best start, none can start earlier
+            for end, (i, k) in automaton.iter(text):
+                if best is not None and end - longest >= best[0]:
+                    break
+                hit = (end - len(k) + 1, i, k)
+                if best is None or hit < best:
+                    best = hit
+            return best[2] if best else None
+
+        return first_match
+
+    # str.find already skips ahead on the keyword's first and last characters
+    # (CPython's fastsearch), which beats both a regex alternation and an
+    # explicit first-character prefilter on ordinary prose. Matching with
+    # re.IGNORECASE to skip the case-folded haystack is slower still (~10x):
+    # the case-insensitive engine can't use a literal prefix scan
+    def first_match(text: str) -> Optional[str]:
+        hits = [(pos, k) for k in unique if (pos := text.find(k)) >= 0]
+        # min() keeps the first of equal positions, i.e. list order
+        return min(hits, key=lambda hit: hit[0])[1] if hits else None
+
+    return first_match
+
+def _keyword_metadata(matched: Optional[List[str]], first: int, last: int) -> dict:
+    """Chunk metadata naming the keywords that kept sections[first:last]."""
+    if matched is None:
+        return {}
+    return {"matched_keywords": list(dict.fromkeys(matched[first:last]))}
+
 def chunk_sections(sections: List[ExtractedSection], strategy: str = "section_aware", keywords: List[str] = None, source_title: str = "Unknown") -> List[Chunk]:
     """
     Chunks extracted sections into blocks respecting MAX_TOKENS.
-    If keywords are provided, only sections containing at least one keyword are kept.
+    If keywords are provided, only sections containing at least one keyword are kept,
+    and each chunk lists the keywords that kept its sections in metadata["matched_keywords"].
     Strategy:
     - 'section_aware': Preserves section/block integrity. If a block fits, add it. If not, start new chunk.
     - 'fixed_size': Strictly enforces MAX_TOKENS by splitting text if necessary.
     """
+    matched = None
     if keywords:
         # Normalize keywords for case-insensitive matching
-        k_lower = [k.lower().strip() for k in keywords if k.strip()]
-        if k_lower:
-            filtered_sections = []
-            for sec in sections:
-                content_lower = (sec.heading + " " + sec.content).lower()
-                if any(k in content_lower for k in k_lower):
-                    filtered_sections.append(sec)
-            sections = filtered_sections
-            logger.info(f"Filtering enabled. Kept {len(sections)} sections matching keywords: {k_lower}")
+        k_folded = [k for k in (k.strip().casefold() for k in keywords) if k]
+        if k_folded:
+            first_match = _keyword_matcher(k_folded)
+            # Remember which keyword kept each section, so chunks can report
+            # it without scanning the text a second time
+            kept = [
+                (sec, kw) for sec in sections
+                if (kw := first_match(_haystack(sec.heading, sec.content))) is not None
+            ]
+            sections = [sec for sec, _ in kept]
+            matched = [kw for _, kw in kept]
+            logger.info(
+                "Filtering enabled. Kept %d sections matching keywords: %s",
+                len(sections), k_folded,
+            )
 
     logger.info(f"Starting chunking with strategy='{strategy}' and MAX_TOKENS={MAX_TOKENS}")
 
     chunks = []
     chunk_id_counter = 1
 
+    # Chunk text is collected as a list of pieces and joined once per chunk;
+    # current_len tracks its length so tokens never need a re-measure.
+    # The packing itself is a few integer ops per section; the time goes to
+    # string joins and building Chunk models, which a JIT would not touch
     if strategy == "section_aware":
-        current_chunk_text = ""
+        current_parts = []
+        current_len = 0
         current_heading = ""
+        current_first = 0
 
-        for sec in sections:
-            block = f"{sec.heading}\n{sec.content}\n"
-            block_tokens = estimate_tokens(block)
+        for i, sec in enumerate(sections):
+            # Read each model field once; the heading is needed again below
+            heading = sec.heading
+            block = f"{heading}\n{sec.content}\n"
+            block_len = len(block)
 
-            current_tokens = estimate_tokens(current_chunk_text)
-
-            if current_tokens + block_tokens > MAX_TOKENS:
-                if current_chunk_text:
+            if current_len // 4 + block_len // 4 > MAX_TOKENS:
+                if current_parts:
                     chunks.append(Chunk(
                         chunk_id=chunk_id_counter,
                         source_heading=current_heading if current_heading else "Unknown",
                         source_title=source_title,
-                        text=current_chunk_text,
-                        token_estimate=current_tokens
+                        text="".join(current_parts),
+                        token_estimate=current_len // 4,
+                        metadata=_keyword_metadata(matched, current_first, i)
                     ))
                     chunk_id_counter += 1
 
-                current_chunk_text = block
-                current_heading = sec.heading
+                current_parts = [block]
+                current_len = block_len
+                current_heading = heading
+                current_first = i
             else:
-                if not current_chunk_text:
-                    current_heading = sec.heading
-                current_chunk_text += block
+                if not current_parts:
+                    current_heading = heading
+                    current_first = i
+                current_parts.append(block)
+                current_len += block_len
 
-        if current_chunk_text:
+        if current_parts:
             chunks.append(Chunk(
                 chunk_id=chunk_id_counter,
                 source_heading=current_heading if current_heading else "Unknown",
                 source_title=source_title,
-                text=current_chunk_text,
-                token_estimate=estimate_tokens(current_chunk_text)
+                text="".join(current_parts),
+                token_estimate=current_len // 4,
+                metadata=_keyword_metadata(matched, current_first, len(sections))
             ))
 
     elif strategy == "fixed_size":
@@ -84,49 +169,61 @@ def chunk_sections(sections: List[ExtractedSection], strategy: str = "section_aw
         # But we need 'source_heading'.
         # Let's iterate and fill.
 
-        current_chunk_text = ""
-        current_heading = ""
+        blocks = [(sec.heading, f"{sec.heading}\n{sec.content}\n") for sec in sections]
+
+        # Spread the text evenly over the fewest chunks MAX_TOKENS allows,
+        # instead of filling every chunk to the limit and leaving a short
+        # remainder at the end
+        total_len = sum(len(block) for _, block in blocks)
+        n_chunks = max(1, -(-total_len // (MAX_TOKENS * 4)))
+        chunk_chars = -(-total_len // n_chunks)
+        limit = min(MAX_TOKENS, -(-chunk_chars // 4))
 
-        for sec in sections:
-            block = f"{sec.heading}\n{sec.content}\n"
+        current_parts = []
+        current_len = 0
+        current_heading = ""
+        current_first = 0
 
-            remaining_block = block
-            first_pass = True
+        for i, (heading, block) in enumerate(blocks):
+            block_len = len(block)
 
-            while remaining_block:
-                if first_pass:
-                    if not current_chunk_text:
-                        current_heading = sec.heading
-                    first_pass = False
+            if not current_parts:
+                current_heading = heading
+                current_first = i
 
-                current_tokens = estimate_tokens(current_chunk_text)
-                space_tokens = MAX_TOKENS - current_tokens
-                space_chars = space_tokens * 4
+            # Walk the block by offset, slicing off only what each chunk takes
+            pos = 0
+            while pos < block_len:
+                space_chars = (limit - current_len // 4) * 4
+                take = min(space_chars, block_len - pos)
+                current_parts.append(block[pos:pos + take])
+                current_len += take
+                pos += take
 
-                if space_chars <= 0:
+                if current_len // 4 >= limit:
                     # Chunk full
                     chunks.append(Chunk(
                         chunk_id=chunk_id_counter,
                         source_heading=current_heading if current_heading else "Unknown",
-                        text=current_chunk_text,
-                        token_estimate=current_tokens
+                        source_title=source_title,
+                        text="".join(current_parts),
+                        token_estimate=current_len // 4,
+                        metadata=_keyword_metadata(matched, current_first, i + 1)
                     ))
                     chunk_id_counter += 1
-                    current_chunk_text = ""
-                    current_heading = sec.heading # Next chunk starts in this section
-                    continue
-
-                part = remaining_block[:space_chars]
-                current_chunk_text += part
-                remaining_block = remaining_block[space_chars:]
+                    current_parts = []
+                    current_len = 0
+                    current_heading = heading # Next chunk starts in this section
+                    current_first = i
 
-        if current_chunk_text:
+        if current_parts:
              chunks.append(Chunk(
                 chunk_id=chunk_id_counter,
                 source_heading=current_heading if current_heading else "Unknown",
                 source_title=source_title,
-                text=current_chunk_text,
-                token_estimate=estimate_tokens(current_chunk_text)
+                text="".join(current_parts),
+                token_estimate=current_len // 4,
+                metadata=_keyword_metadata(matched, current_first, len(blocks))
             ))
 
     else:
@@ -1,6 +1,16 @@
+import copy
+import os
+from datetime import datetime
 from typing import Dict, Any
 from contracts.output_schema import FinalOutput, OutputMetadata
 
+# Composed outputs are plain dicts built straight in FinalOutput's shape;
+# set VALIDATE_OUTPUT=true to also run them through the pydantic schema
+VALIDATE_OUTPUT = os.getenv("VALIDATE_OUTPUT", "false").lower() == "true"
+
+# Default OutputMetadata would fill in
+_PIPELINE_VERSION = OutputMetadata.model_fields["pipeline_version"].default
+
 def compose_output(ai_result: Dict[str, Any], output_type: str) -> Dict[str, Any]:
     """
     Composes the final output from AI results.
@@ -17,19 +27,23 @@ def compose_output(ai_result: Dict[str, Any], output_type: str) -> Dict[str, Any
     if not summary and "evidence" in ai_result:
         summary = "Generated from NotebookLM Evidence"
 
-    # Create metadata
-    metadata = OutputMetadata(
-        output_type=output_type,
-        ai_metadata={"raw_keys": list(ai_result.keys())}
-    )
+    # Same dict FinalOutput(...).model_dump() returns, without building
+    # and dumping two models per result
+    final_output = {
+        "summary": summary,
+        "metadata": {
+            "timestamp": datetime.now().isoformat(),
+            "output_type": output_type,
+            "pipeline_version": _PIPELINE_VERSION,
+            "ai_metadata": {"raw_keys": list(ai_result.keys())},
+            "sources": None,
+        },
+        "format": "json",
+        "content": copy.deepcopy(ai_result),
+    }
 
-    # Construct final output object
-    final_output = FinalOutput(
-        summary=summary,
-        metadata=metadata,
-        format="json",
-        content=ai_result
-    )
+    if VALIDATE_OUTPUT:
+        FinalOutput.model_validate(final_output)
 
     # Return as dict for serialization
-    return final_output.model_dump()
+    return final_output
@@ -4,6 +4,8 @@ def build_context(request: ContentRequest) -> dict:
     """
     Extracts context from the request for AI prompting.
     This context is NOT used in crawling (stability), but in AI prompting + output shaping.
+    It stays a plain dict: every AI backend reads it with .get() and run.py
+    adds keys (discovery_method) after it is built.
     """
     return {
         "grade": request.grade,
@@ -6,6 +6,7 @@ Coordinates InputSourcePromptBuilder, OutputTypePromptBuilder, DifficultyEngine,
 """
 
 import logging
+from functools import lru_cache
 from typing import Dict, Optional, List
 
 from .input_source_prompts import InputSourcePromptBuilder
@@ -15,6 +16,68 @@ from .format_adapter import OutputFormatAdapter
 
 logger = logging.getLogger(__name__)
 
+# Common subjects as (lowercase, display) pairs, checked in order
+_SUBJECTS = tuple(
+    (subject.lower(), subject)
+    for subject in ("Physics", "Chemistry", "Biology", "Math", "Science", "History", "English")
+)
+
+
+# DifficultyEngine holds no per-request state, so every orchestrator shares one
+_DIFFICULTY_ENGINE = DifficultyEngine()
+
+
+@lru_cache(maxsize=64)
+def _format_adapter(formats: tuple) -> OutputFormatAdapter:
+    """
+    Shared OutputFormatAdapter per format list; an adapter's only state is
+    its normalized formats.
+    """
+    return OutputFormatAdapter({'formats': list(formats)})
+
+
+@lru_cache(maxsize=256)
+def _parse_keywords_cached(keywords_report: str, subtopics) -> tuple:
+    """
+    PromptOrchestrator._parse_keywords() for hashable inputs (subtopics as a
+    tuple or comma-separated string), so requests in a batch that share
+    keywords are only parsed once.
+    """
+    keywords = []
+
+    # Parse keywords_report
+    if keywords_report:
+        keywords.extend([k.strip() for k in keywords_report.split(',') if k.strip()])
+
+    # Add subtopics
+    if subtopics and isinstance(subtopics, tuple):
+        keywords.extend(subtopics)
+    elif subtopics and isinstance(subtopics, str):
+        # Handle case where subtopics is still a string
+        keywords.extend([s.strip() for s in subtopics.split(',') if s.strip()])
+
+    # Remove case-insensitive duplicates, keeping the first spelling and
+    # the original order
+    unique_keywords = {}
+    for k in keywords:
+        unique_keywords.setdefault(k.lower(), k)
+
+    return tuple(unique_keywords.values())
+
+
+def _insert_after_line(text: str, n: int, block: str) -> str:
+    """
+    Same as lines = text.split('\\n'); lines.insert(n, block); '\\n'.join(lines),
+    by splicing at the n-th newline instead of splitting every line.
+    """
+    i = -1
+    for _ in range(n):
+        i = text.find('\n', i + 1)
+        if i == -1:
+            # Fewer than n + 1 lines: insert() appends
+            return f"{text}\n{block}"
+    return f"{text[:i + 1]}{block}\n{text[i + 1:]}"
+
 
 class PromptOrchestrator:
     """
@@ -27,6 +90,13 @@ class PromptOrchestrator:
         - Module D: DifficultyEngine (Bloom's taxonomy)
     """
 
+    # output_config flag -> (prompt name, builder method), in output order
+    _PROMPT_BUILDERS = (
+        ('quiz', 'quiz', 'build_quiz_prompt'),
+        ('studyGuide', 'study_guide', 'build_study_guide_prompt'),
+        ('handout', 'handout', 'build_handout_prompt'),
+    )
+
     def __init__(self, context: Dict):
         """
         Initialize the prompt orchestrator with context from ContentRequest.
@@ -44,31 +114,28 @@ class PromptOrchestrator:
                 - keywords_report: str (optional)
         """
         self.context = context
+        get = context.get
 
         # Extract core parameters
-        self.grade = context.get('grade', 'General')
-        self.topic = context.get('topic', '')
-        self.subtopics = context.get('subtopics', [])
-        self.difficulty = context.get('difficulty', 'Medium')
-        self.output_config = context.get('output_config', {})
-        self.quiz_config = context.get('quiz_config', {})
-        self.purpose = context.get('purpose', '')
+        self.grade = get('grade', 'General')
+        self.topic = get('topic', '')
+        self.subtopics = get('subtopics', [])
+        self.difficulty = get('difficulty', 'Medium')
+        self.output_config = get('output_config', {})
+        self.quiz_config = get('quiz_config', {})
+        self.purpose = get('purpose', '')
 
         # Extract keywords for report generation
-        keywords_report = context.get('keywords_report', '')
-        self.keywords = self._parse_keywords(keywords_report, self.subtopics)
+        self.keywords = self._parse_keywords(get('keywords_report', ''), self.subtopics)
 
         # Extract subject from topic (first word typically)
         self.subject = self._extract_subject(self.topic)
 
-        # Initialize sub-modules
-        self.difficulty_engine = DifficultyEngine()
-
-        self.format_adapter = OutputFormatAdapter({
-            'formats': context.get('output_formats', ['markdown'])
-        })
+        # Sub-modules are shared between orchestrators
+        self.difficulty_engine = _DIFFICULTY_ENGINE
+        self.format_adapter = _format_adapter(tuple(get('output_formats', ['markdown'])))
 
-        logger.info(f"PromptOrchestrator initialized for {self.grade} {self.subject} - {self.topic}")
+        logger.info("PromptOrchestrator initialized for %s %s - %s", self.grade, self.subject, self.topic)
 
     def _parse_keywords(self, keywords_report: str, subtopics: List) -> List[str]:
         """
@@ -81,30 +148,13 @@ class PromptOrchestrator:
         Returns:
             Unified list of keywords
         """
-        keywords = []
-
-        # Parse keywords_report
-        if keywords_report:
-            keywords.extend([k.strip() for k in keywords_report.split(',') if k.strip()])
-
-        # Add subtopics
-        if subtopics and isinstance(subtopics, list):
-            keywords.extend(subtopics)
-        elif subtopics and isinstance(subtopics, str):
-            # Handle case where subtopics is still a string
-            keywords.extend([s.strip() for s in subtopics.split(',') if s.strip()])
-
-        # Remove duplicates while preserving order
-        seen = set()
-        unique_keywords = []
-        for k in keywords:
-            if k.lower() not in seen:
-                seen.add(k.lower())
-                unique_keywords.append(k)
-
-        return unique_keywords
-
-    def _extract_subject(self, topic: str) -> str:
+        if isinstance(subtopics, list):
+            subtopics = tuple(subtopics)
+        return list(_parse_keywords_cached(keywords_report, subtopics))
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _extract_subject(topic: str) -> str:
         """
         Extract subject from topic string.
 
@@ -112,11 +162,9 @@ class PromptOrchestrator:
             "Physics Gravity" → "Physics"
             "Gravity" → "General"
         """
-        # Common subjects
-        subjects = ["Physics", "Chemistry", "Biology", "Math", "Science", "History", "English"]
-
-        for subject in subjects:
-            if subject.lower() in topic.lower():
+        topic_lower = topic.lower()
+        for subject_lower, subject in _SUBJECTS:
+            if subject_lower in topic_lower:
                 return subject
 
         # Default to General
@@ -151,10 +199,8 @@ class PromptOrchestrator:
             purpose=self.purpose
         )
 
-        # Insert difficulty constraints after first line
-        lines = base_prompt.split('\n')
-        lines.insert(2, '\n' + difficulty_constraints + '\n')
-        base_prompt = '\n'.join(lines)
+        # Insert difficulty constraints after the first two lines
+        base_prompt = _insert_after_line(base_prompt, 2, '\n' + difficulty_constraints + '\n')
 
         # Add format constraints (CSV)
         enhanced_prompt = self.format_adapter.inject_format_rules(base_prompt, 'csv')
@@ -251,18 +297,14 @@ class PromptOrchestrator:
         Returns:
             Dictionary with keys: 'quiz', 'study_guide', 'handout' (if enabled)
         """
-        prompts = {}
-
-        if self.output_config.get('quiz', False):
-            prompts['quiz'] = self.build_quiz_prompt(self.context)
-
-        if self.output_config.get('studyGuide', False):
-            prompts['study_guide'] = self.build_study_guide_prompt(self.context)
-
-        if self.output_config.get('handout', False):
-            prompts['handout'] = self.build_handout_prompt(self.context)
-
-        logger.info(f"Built {len(prompts)} prompts: {list(prompts.keys())}")
+        output_config = self.output_config
+        prompts = {
+            name: getattr(self, builder)(self.context)
+            for config_key, name, builder in self._PROMPT_BUILDERS
+            if output_config.get(config_key, False)
+        }
+
+        logger.info("Built %d prompts: %s", len(prompts), list(prompts))
         return prompts
 
     def validate_prompt(self, prompt: str, output_type: str) -> tuple:
@@ -8,23 +8,36 @@ Based on Section 3.1: "Format-Constraint Prompting"
 """
 
 import logging
-from typing import List, Dict
+import re
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Dict, Mapping
 
 logger = logging.getLogger(__name__)
 
+# A CSV output's first non-blank text; matched in place rather than via
+# output.strip(), which copies the whole (possibly large) output
+_CSV_START = re.compile(r'\s*(?:```csv|ID,|Column)')
+
 
 class OutputFormatAdapter:
     """
     Adapts prompts based on target output format requirements.
 
     Supports: CSV, PDF, HTML, DOCX, Markdown (default)
+
+    Only inject_multi_format_rules() uses the configured formats; the other
+    methods read just the class tables and can be called on the class.
     """
 
+    # The class tables are read-only (MappingProxyType, with tuples for
+    # lists), so nothing handed out by a method can change them for others
+
     # Format-specific constraints
-    FORMAT_CONSTRAINTS = {
-        'csv': {
+    FORMAT_CONSTRAINTS = MappingProxyType({
+        'csv': MappingProxyType({
             'header': 'CSV FORMAT REQUIREMENTS',
-            'rules': [
+            'rules': (
                 'Output ONLY a raw code block containing CSV data',
                 'Do not include any introductory text or closing remarks',
                 'Do not use conversational language like "Here is your CSV..."',
@@ -32,26 +45,26 @@ class OutputFormatAdapter:
                 'Escape commas within cell content with quotes',
                 'No blank lines between rows',
                 'First row must be column headers'
-            ],
+            ),
             'example': '```csv\nID,Name,Value\n1,Item A,100\n2,Item B,200\n```'
-        },
+        }),
 
-        'pdf': {
+        'pdf': MappingProxyType({
             'header': 'PDF LAYOUT REQUIREMENTS',
-            'rules': [
+            'rules': (
                 'Include page break markers: <!-- PAGE_BREAK -->',
                 'Specify image placements: [IMAGE: description | position: center/left/right]',
                 'Use clear section headings with Markdown # ## ###',
                 'Include table of contents markers: <!-- TOC -->',
                 'Maintain consistent formatting for print readability',
                 'Avoid excessive line breaks (will waste printed pages)'
-            ],
+            ),
             'example': 'Use <!-- PAGE_BREAK --> to start new page'
-        },
+        }),
 
-        'html': {
+        'html': MappingProxyType({
             'header': 'HTML FORMAT REQUIREMENTS',
-            'rules': [
+            'rules': (
                 'Wrap output in complete HTML5 document structure',
                 'Include <!DOCTYPE html> declaration',
                 'Add <head> section with CDN scripts for Mermaid.js and MathJax',
@@ -59,42 +72,42 @@ class OutputFormatAdapter:
                 'Include proper heading hierarchy (<h1>, <h2>, <h3>)',
                 'Add CSS classes for styling hooks',
                 'Ensure accessibility with alt text and ARIA labels'
-            ],
-            'cdn_scripts': [
+            ),
+            'cdn_scripts': (
                 '<script type="module">import mermaid from "https://cdn.jsdelivr.net/npm/mermaid@10/dist/mermaid.esm.min.mjs"; mermaid.initialize({ startOnLoad: true });</script>',
                 '<script src="https://polyfill.io/v3/polyfill.min.js?features=es6"></script>',
                 '<script id="MathJax-script" async src="https://cdn.jsdelivr.net/npm/mathjax@3/es5/tex-mml-chtml.js"></script>'
-            ]
-        },
+            )
+        }),
 
-        'docx': {
+        'docx': MappingProxyType({
             'header': 'DOCX (Word) FORMAT REQUIREMENTS',
-            'rules': [
+            'rules': (
                 'Use Markdown syntax compatible with Pandoc conversion',
                 'Use ### for headings (will convert to Word heading styles)',
                 'Use **bold** and *italic* for emphasis',
                 'Tables should use Markdown pipe syntax',
                 'For complex formatting, include Pandoc-specific syntax',
                 'Avoid HTML tags (use Markdown equivalents)'
-            ],
+            ),
             'example': '**Bold text** and *italic text* for Word compatibility'
-        },
+        }),
 
-        'sheets': {
+        'sheets': MappingProxyType({
             'header': 'GOOGLE SHEETS / EXCEL FORMAT REQUIREMENTS',
-            'rules': [
+            'rules': (
                 'Same as CSV format but include formula syntax where appropriate',
                 'Use Excel formula syntax: =SUM(A1:A10) or =IF(B1>0,"Yes","No")',
                 'Include data validation rules as comments: <!-- VALIDATION: A2:A100 must be numeric -->',
                 'For dropdown lists, include options: <!-- DROPDOWN: Option1,Option2,Option3 -->',
                 'Reserve first row for column headers with clear names'
-            ],
+            ),
             'example': '=IF(G2=D2,"Correct","Incorrect") for auto-grading'
-        },
+        }),
 
-        'markdown': {
+        'markdown': MappingProxyType({
             'header': 'MARKDOWN FORMAT REQUIREMENTS',
-            'rules': [
+            'rules': (
                 'Use standard Markdown syntax',
                 'Use # ## ### for heading hierarchy',
                 'Use ``` for code blocks with language specification',
@@ -102,10 +115,47 @@ class OutputFormatAdapter:
                 'Use - or * for unordered lists',
                 'Use 1. 2. 3. for ordered lists',
                 'Use | for tables with header separator'
-            ],
+            ),
             'example': '```python\ncode here\n```'
-        }
-    }
+        })
+    })
+
+    # Things to avoid per format ("negative constraints")
+    NEGATIVE_CONSTRAINTS = MappingProxyType({
+        'csv': (
+            'Do not add any explanatory text before or after the CSV',
+            'Do not use pipe | or tab separators',
+            'Do not add blank lines for readability',
+            'Do not add row numbers as a separate column (unless specified in headers)'
+        ),
+        'pdf': (
+            'Do not use excessive whitespace (wastes printed pages)',
+            'Do not use colors that don\'t print well (prefer high contrast)',
+            'Do not break tables across page boundaries without headers'
+        ),
+        'html': (
+            'Do not use inline styles (use classes instead)',
+            'Do not use deprecated HTML tags (<font>, <center>, etc.)',
+            'Do not forget alt text for images'
+        ),
+        'docx': (
+            'Do not use HTML tags (use Markdown)',
+            'Do not use complex CSS (won\'t convert to Word)',
+            'Do not use Unicode characters that may not render in Word'
+        ),
+        'markdown': (
+            'Do not mix HTML and Markdown unnecessarily',
+            'Do not use inconsistent heading levels (don\'t skip from # to ###)'
+        )
+    })
+
+    # Alternative format names and the standard format each maps to
+    FORMAT_ALIASES = MappingProxyType({
+        'excel': 'sheets', 'xlsx': 'sheets', 'xls': 'sheets',
+        'word': 'docx', 'doc': 'docx',
+        'htm': 'html',
+        'md': 'markdown',
+    })
 
     def __init__(self, output_config: dict):
         """
@@ -119,9 +169,10 @@ class OutputFormatAdapter:
         # Normalize format names
         self.formats = [self._normalize_format(f) for f in self.formats]
 
-        logger.info(f"OutputFormatAdapter initialized for formats: {self.formats}")
+        logger.info("OutputFormatAdapter initialized for formats: %s", self.formats)
 
-    def _normalize_format(self, format_type: str) -> str:
+    @classmethod
+    def _normalize_format(cls, format_type: str) -> str:
         """
         Normalize format string to lowercase standard values.
 
@@ -134,18 +185,10 @@ class OutputFormatAdapter:
         format_lower = format_type.lower()
 
         # Map alternative names
-        if format_lower in ['excel', 'xlsx', 'xls']:
-            return 'sheets'
-        elif format_lower in ['word', 'doc']:
-            return 'docx'
-        elif format_lower in ['htm']:
-            return 'html'
-        elif format_lower in ['md']:
-            return 'markdown'
-
-        return format_lower
-
-    def get_format_constraints(self, format_type: str) -> dict:
+        return cls.FORMAT_ALIASES.get(format_lower, format_lower)
+
+    @classmethod
+    def get_format_constraints(cls, format_type: str) -> Mapping:
         """
         Get format-specific constraints.
 
@@ -153,19 +196,20 @@ class OutputFormatAdapter:
             format_type: Target format (csv, pdf, html, docx, sheets, markdown)
 
         Returns:
-            Dictionary with keys: header, rules, example (if available)
+            Read-only mapping with keys: header, rules, example (if available)
         """
-        format_type = self._normalize_format(format_type)
+        format_type = cls._normalize_format(format_type)
 
-        constraints = self.FORMAT_CONSTRAINTS.get(
+        constraints = cls.FORMAT_CONSTRAINTS.get(
             format_type,
-            self.FORMAT_CONSTRAINTS['markdown']  # Default
+            cls.FORMAT_CONSTRAINTS['markdown']  # Default
         )
 
-        logger.debug(f"Retrieved constraints for {format_type}: {len(constraints['rules'])} rules")
+        logger.debug("Retrieved constraints for %s: %d rules", format_type, len(constraints['rules']))
         return constraints
 
-    def inject_format_rules(self, base_prompt: str, format_type: str) -> str:
+    @classmethod
+    def inject_format_rules(cls, base_prompt: str, format_type: str) -> str:
         """
         Inject format-specific rules into a base prompt.
 
@@ -176,28 +220,54 @@ class OutputFormatAdapter:
         Returns:
             Enhanced prompt with format constraints appended
         """
-        format_type = self._normalize_format(format_type)
+        format_type = cls._normalize_format(format_type)
+        rules_text = cls._rules_for(format_type)
+
+        # Append to base prompt
+        enhanced_prompt = base_prompt + rules_text
+
+        logger.debug("Injected %s format rules into prompt (+%d chars)", format_type, len(rules_text))
+        return enhanced_prompt
+
+    @classmethod
+    def _rules_for(cls, format_type: str) -> str:
+        """
+        Rendered rules for a normalized format. Unknown formats share the
+        markdown block rather than each adding a cache entry, so at most one
+        block per FORMAT_CONSTRAINTS key is ever rendered.
+        """
+        if format_type not in cls.FORMAT_CONSTRAINTS:
+            format_type = 'markdown'  # Default
+        return cls._format_rules_text(format_type)
 
-        # Get constraints for this format
-        constraints = self.get_format_constraints(format_type)
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _format_rules_text(cls, format_type: str) -> str:
+        """
+        The rules section inject_format_rules() appends for a
+        FORMAT_CONSTRAINTS key. It only depends on that class constant, so
+        it is rendered once per format and every later call is a lookup.
+        That is also why this isn't a Jinja2 template like the input-source
+        prompts: rendering runs once per format either way, and the
+        per-prompt cost is the cache hit.
+        """
+        constraints = cls.FORMAT_CONSTRAINTS[format_type]
 
-        # Build format rules section
-        rules_text = f"\n\n{constraints['header']}:\n"
-        rules_text += "\n".join(f"- {rule}" for rule in constraints['rules'])
+        # Build format rules section as a list of pieces, joined once
+        parts = [
+            f"\n\n{constraints['header']}:\n",
+            "\n".join(f"- {rule}" for rule in constraints['rules']),
+        ]
 
         if 'example' in constraints:
-            rules_text += f"\n\nEXAMPLE:\n{constraints['example']}"
+            parts.append(f"\n\nEXAMPLE:\n{constraints['example']}")
 
         # Special handling for HTML (add CDN scripts info)
         if format_type == 'html' and 'cdn_scripts' in constraints:
-            rules_text += "\n\nREQUIRED CDN SCRIPTS (include in <head>):\n"
-            rules_text += "\n".join(constraints['cdn_scripts'])
-
-        # Append to base prompt
-        enhanced_prompt = base_prompt + rules_text
+            parts.append("\n\nREQUIRED CDN SCRIPTS (include in <head>):\n")
+            parts.append("\n".join(constraints['cdn_scripts']))
 
-        logger.debug(f"Injected {format_type} format rules into prompt (+{len(rules_text)} chars)")
-        return enhanced_prompt
+        return "".join(parts)
 
     def inject_multi_format_rules(self, base_prompt: str) -> str:
         """
@@ -214,23 +284,24 @@ class OutputFormatAdapter:
         if not self.formats or len(self.formats) == 0:
             return base_prompt
 
-        # Primary format (first in list)
+        # Primary format (first in list); self.formats is normalized in __init__
         primary_format = self.formats[0]
-
-        # For single format, just inject that
-        if len(self.formats) == 1:
-            return self.inject_format_rules(base_prompt, primary_format)
-
-        # For multiple formats, add note
-        enhanced_prompt = base_prompt + f"\n\nPRIMARY OUTPUT FORMAT: {primary_format.upper()}"
-        enhanced_prompt += f"\nNote: Output will be converted to additional formats: {', '.join(self.formats[1:])}"
-
-        # Inject primary format rules
-        enhanced_prompt = self.inject_format_rules(enhanced_prompt, primary_format)
-
-        return enhanced_prompt
-
-    def get_negative_constraints(self, format_type: str) -> List[str]:
+        parts = [base_prompt]
+
+        # For multiple formats, add note before the primary format rules
+        if len(self.formats) > 1:
+            parts.append(f"\n\nPRIMARY OUTPUT FORMAT: {primary_format.upper()}")
+            parts.append(
+                "\nNote: Output will be converted to additional formats: "
+                f"{', '.join(self.formats[1:])}"
+            )
+
+        # The prompt is copied once, whatever the number of formats
+        parts.append(self._rules_for(primary_format))
+        return "".join(parts)
+
+    @classmethod
+    def get_negative_constraints(cls, format_type: str) -> List[str]:
         """
         Get "negative constraints" - things to avoid for this format.
 
@@ -240,39 +311,12 @@ class OutputFormatAdapter:
         Returns:
             List of constraint strings
         """
-        format_type = self._normalize_format(format_type)
-
-        negative_constraints = {
-            'csv': [
-                'Do not add any explanatory text before or after the CSV',
-                'Do not use pipe | or tab separators',
-                'Do not add blank lines for readability',
-                'Do not add row numbers as a separate column (unless specified in headers)'
-            ],
-            'pdf': [
-                'Do not use excessive whitespace (wastes printed pages)',
-                'Do not use colors that don\'t print well (prefer high contrast)',
-                'Do not break tables across page boundaries without headers'
-            ],
-            'html': [
-                'Do not use inline styles (use classes instead)',
-                'Do not use deprecated HTML tags (<font>, <center>, etc.)',
-                'Do not forget alt text for images'
-            ],
-            'docx': [
-                'Do not use HTML tags (use Markdown)',
-                'Do not use complex CSS (won\'t convert to Word)',
-                'Do not use Unicode characters that may not render in Word'
-            ],
-            'markdown': [
-                'Do not mix HTML and Markdown unnecessarily',
-                'Do not use inconsistent heading levels (don\'t skip from # to ###)'
-            ]
-        }
-
-        return negative_constraints.get(format_type, [])
-
-    def add_negative_constraints(self, prompt: str, format_type: str) -> str:
+        format_type = cls._normalize_format(format_type)
+
+        return list(cls.NEGATIVE_CONSTRAINTS.get(format_type, ()))
+
+    @classmethod
+    def add_negative_constraints(cls, prompt: str, format_type: str) -> str:
         """
         Add negative constraints to prompt.
 
@@ -283,20 +327,33 @@ class OutputFormatAdapter:
         Returns:
             Prompt with negative constraints added
         """
-        negatives = self.get_negative_constraints(format_type)
-
-        if not negatives:
+        format_type = cls._normalize_format(format_type)
+        if format_type not in cls.NEGATIVE_CONSTRAINTS:
             return prompt
 
-        negative_text = "\n\nCRITICAL - DO NOT:\n"
-        negative_text += "\n".join(f"- {constraint}" for constraint in negatives)
+        negative_text = cls._negative_text(format_type)
+
+        if not negative_text:
+            return prompt
 
         enhanced_prompt = prompt + negative_text
 
-        logger.debug(f"Added {len(negatives)} negative constraints for {format_type}")
+        logger.debug("Added negative constraints for %s", format_type)
         return enhanced_prompt
 
-    def validate_output_format(self, output: str, format_type: str) -> tuple:
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _negative_text(cls, format_type: str) -> str:
+        """The "DO NOT" section for a NEGATIVE_CONSTRAINTS key ('' if it is empty)."""
+        negatives = cls.NEGATIVE_CONSTRAINTS[format_type]
+
+        if not negatives:
+            return ""
+
+        return "\n\nCRITICAL - DO NOT:\n" + "\n".join(f"- {constraint}" for constraint in negatives)
+
+    @classmethod
+    def validate_output_format(cls, output: str, format_type: str) -> tuple:
         """
         Validate that output matches format requirements.
 
@@ -307,14 +364,15 @@ class OutputFormatAdapter:
         Returns:
             Tuple of (is_valid: bool, issues: List[str])
         """
-        format_type = self._normalize_format(format_type)
+        format_type = cls._normalize_format(format_type)
         issues = []
 
         # CSV validation
         if format_type == 'csv':
-            if not output.strip().startswith(('```csv', 'ID,', 'Column')):
+            if not _CSV_START.match(output):
                 issues.append("CSV output should start with headers or code block")
 
+            # Two str `in` scans beat one regex alternation here
             if 'Here is' in output or 'Below is' in output:
                 issues.append("CSV contains conversational text (should be pure data)")
 
@@ -34,12 +34,14 @@ from postprocess.chunker import chunk_sections  # noqa: E402
 from contracts.content_request import ContentRequest  # noqa: E402
 # Correctly import from the new unified router
 from discovery.discovery_router import filter_urls, discover_urls  # noqa: E402
+from discovery.search_manager import SearchManager  # noqa: E402
 from postprocess.context_builder import build_context  # noqa: E402
 from postprocess.composer import compose_output  # noqa: E402
 from ai_pipeline.ai_router import run_ai  # noqa: E402
 
 # Load env vars
 load_dotenv(override=True)
+SearchManager.reload_env()
 
 # Setup logging
 setup_logging()
@@ -108,6 +110,9 @@ def get_content_request() -> ContentRequest:
              os.environ["NOTEBOOKLM_INJECTION_MODE"] = mode
              logger.info(f"Config: NOTEBOOKLM_INJECTION_MODE set to {mode}")
 
+        # Credentials are cached at import; pick up the injected ones
+        SearchManager.reload_env()
+
     return ContentRequest(
         grade=os.getenv("CR_GRADE", "Grade 8"),
         topic=os.getenv("CR_TOPIC", "Exponents"),
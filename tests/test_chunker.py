@@ -0,0 +1,122 @@
+"""
+Tests for keyword filtering in the section chunker.
+Each test runs with the Aho-Corasick matcher (when installed) and the
+substring fallback, which must keep the same sections.
+"""
+
+import pytest
+
+from contracts.extraction_schema import ExtractedSection
+from postprocess import chunker
+from postprocess.chunker import chunk_sections
+
+
+@pytest.fixture(autouse=True, params=["ahocorasick", "substring"])
+def matcher(request, monkeypatch):
+    if request.param == "ahocorasick" and chunker.ahocorasick is None:
+        pytest.skip("pyahocorasick not installed")
+    if request.param == "substring":
+        monkeypatch.setattr(chunker, "ahocorasick", None)
+    return request.param
+
+
+SECTIONS = [
+    ExtractedSection(heading="Gravity", content="Mass attracts mass."),
+    ExtractedSection(heading="Orbits", content="Satellites fall around Earth."),
+    ExtractedSection(heading="Optics", content="Light bends in (glass)."),
+]
+
+
+def test_keywords_match_heading_or_content_case_insensitively():
+    chunks = chunk_sections(SECTIONS, keywords=["GRAVITY", " satellites ", ""])
+
+    assert len(chunks) == 1
+    assert "Gravity" in chunks[0].text and "Orbits" in chunks[0].text
+    assert "Optics" not in chunks[0].text
+
+
+def test_keywords_are_matched_literally():
+    chunks = chunk_sections(SECTIONS, keywords=["(glass)", "a.tracts"])
+
+    assert [c.source_heading for c in chunks] == ["Optics"]
+    assert "Gravity" not in chunks[0].text
+
+
+def test_blank_keywords_keep_every_section():
+    chunks = chunk_sections(SECTIONS, keywords=["  "])
+
+    assert all(s.heading in chunks[0].text for s in SECTIONS)
+
+
+def test_rechunking_reuses_lowercased_sections():
+    chunker._haystack.cache_clear()
+
+    chunk_sections(SECTIONS, keywords=["gravity"])
+    chunk_sections(SECTIONS, strategy="fixed_size", keywords=["optics"])
+
+    info = chunker._haystack.cache_info()
+    assert (info.misses, info.hits) == (len(SECTIONS), len(SECTIONS))
+
+
+@pytest.mark.parametrize("strategy", ["section_aware", "fixed_size"])
+def test_chunks_respect_limit_and_report_their_own_length(monkeypatch, strategy):
+    monkeypatch.setattr(chunker, "MAX_TOKENS", 10)
+    sections = [ExtractedSection(heading=f"H{i}", content="word " * 3) for i in range(6)]
+
+    chunks = chunk_sections(sections, strategy=strategy)
+
+    assert len(chunks) > 1
+    assert "".join(c.text for c in chunks) == "".join(f"{s.heading}\n{s.content}\n" for s in sections)
+    for chunk in chunks:
+        assert chunk.token_estimate == len(chunk.text) // 4 <= 10
+
+
+def test_fixed_size_chunks_all_carry_the_source_title(monkeypatch):
+    monkeypatch.setattr(chunker, "MAX_TOKENS", 10)
+    sections = [ExtractedSection(heading="Long", content="x" * 100)]
+
+    chunks = chunk_sections(sections, strategy="fixed_size", source_title="Gravity")
+
+    assert len(chunks) > 2
+    assert {c.source_title for c in chunks} == {"Gravity"}
+
+
+def test_fixed_size_spreads_text_evenly_over_the_fewest_chunks(monkeypatch):
+    monkeypatch.setattr(chunker, "MAX_TOKENS", 10)
+    sections = [ExtractedSection(heading="Long", content="x" * 100)]
+
+    chunks = chunk_sections(sections, strategy="fixed_size")
+
+    # 106 chars need at least ceil(106 / 40) = 3 chunks; balanced, not 40/40/26
+    assert [len(c.text) for c in chunks] == [36, 36, 34]
+
+
+def test_keywords_match_after_unicode_case_folding():
+    sections = [ExtractedSection(heading="STRASSE", content="Road names.")]
+
+    assert len(chunk_sections(sections, keywords=["Straße"])) == 1
+
+
+@pytest.mark.parametrize("strategy", ["section_aware", "fixed_size"])
+def test_chunks_report_the_keywords_that_kept_their_sections(monkeypatch, strategy):
+    monkeypatch.setattr(chunker, "MAX_TOKENS", 8)
+
+    chunks = chunk_sections(SECTIONS, strategy=strategy, keywords=["mass", "satellites"])
+
+    assert chunks[0].metadata["matched_keywords"] == ["mass"]
+    assert chunks[-1].metadata["matched_keywords"] == ["satellites"]
+    assert chunk_sections(SECTIONS, strategy=strategy)[0].metadata == {}
+
+
+def test_matched_keyword_is_the_earliest_in_the_text():
+    sections = [ExtractedSection(heading="Orbits", content="Satellites fall around Earth.")]
+
+    # Listed first but found later in the text
+    chunks = chunk_sections(sections, keywords=["satellites", "orbits"])
+    assert chunks[0].metadata["matched_keywords"] == ["orbits"]
+
+    # Same start position: the keyword listed first wins
+    chunks = chunk_sections(sections, keywords=["satellites fall", "satellites", "orbit"])
+    assert chunks[0].metadata["matched_keywords"] == ["orbit"]
+    chunks = chunk_sections(sections, keywords=["earth", "satellites", "satellites fall"])
+    assert chunks[0].metadata["matched_keywords"] == ["satellites"]
@@ -0,0 +1,45 @@
+"""
+Tests for HTML hygiene before extraction.
+Each test runs against the selectolax fast path (when installed) and the
+BeautifulSoup fallback.
+"""
+
+import pytest
+
+from extractors.html_extractor import extract
+from postprocess import cleaner
+from postprocess.cleaner import clean_html
+
+
+@pytest.fixture(autouse=True, params=["lexbor", "bs4"])
+def backend(request, monkeypatch):
+    if request.param == "lexbor" and cleaner.LexborHTMLParser is None:
+        pytest.skip("selectolax not installed")
+    if request.param == "bs4":
+        monkeypatch.setattr(cleaner, "LexborHTMLParser", None)
+    return request.param
+
+
+PAGE = (
+    "<html><head><style>p{}</style><script>track()</script></head><body>"
+    "<header><p>Logo</p></header><nav><ul><li>Menu</li></ul></nav>"
+    "<article><h1>Gravity</h1><p>Mass attracts mass.</p><noscript>Enable JS</noscript></article>"
+    "<footer><nav><p>Links</p></nav></footer></body></html>"
+)
+
+
+def test_noise_elements_are_removed_with_their_contents():
+    cleaned = clean_html(PAGE)
+
+    assert "<h1>Gravity</h1>" in cleaned
+    assert "<p>Mass attracts mass.</p>" in cleaned
+    for noise in ("track()", "p{}", "Logo", "Menu", "Enable JS", "Links"):
+        assert noise not in cleaned
+
+
+def test_cleaned_page_extracts_only_article_sections():
+    doc = extract(clean_html(PAGE), "https://example.org/gravity")
+
+    assert [s.model_dump() for s in doc.sections] == [
+        {"heading": "Gravity", "content": "Mass attracts mass."},
+    ]
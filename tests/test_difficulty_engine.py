@@ -0,0 +1,112 @@
+"""
+Tests for DifficultyEngine's difficulty mapping and prompt validation.
+Each test runs with the Aho-Corasick verb scan (when installed) and the
+substring fallback, which must report the same issues.
+"""
+
+import pytest
+
+from prompt_modules import difficulty_engine
+from prompt_modules.difficulty_engine import DifficultyEngine
+
+
+@pytest.fixture(autouse=True, params=["ahocorasick", "substring"])
+def verb_scan(request, monkeypatch):
+    if request.param == "ahocorasick" and difficulty_engine.ahocorasick is None:
+        pytest.skip("pyahocorasick not installed")
+    if request.param == "substring":
+        monkeypatch.setattr(difficulty_engine, "ahocorasick", None)
+    return request.param
+
+
+def test_difficulty_aliases_normalize_case_insensitively():
+    engine = DifficultyEngine()
+
+    assert engine._normalize_difficulty("Identify") == "Easy"
+    assert engine._normalize_difficulty("CONNECT") == "Medium"
+    assert engine._normalize_difficulty("challenging") == "Hard"
+    assert engine._normalize_difficulty("impossible") == "Medium"
+
+
+def test_clarification_focus_names_both_compared_concepts():
+    engine = DifficultyEngine()
+
+    focus = engine.generate_purpose_prompt("clarify concept: mass VS. weight", "Gravity")
+
+    assert focus.startswith("PURPOSE: Clarify Distinction Between Mass and Weight")
+    assert "Concept Clarification for Gravity" in engine.generate_purpose_prompt("clarify forces", "Gravity")
+
+
+def test_alignment_flags_avoided_verbs_and_missing_required_ones():
+    engine = DifficultyEngine()
+
+    assert engine.validate_difficulty_alignment("HARD: evaluate and design a rocket", "extend") == (True, [])
+
+    is_valid, issues = engine.validate_difficulty_alignment("Hard: define and label the parts", "Hard")
+    assert not is_valid
+    assert issues[:2] == [
+        "Prompt uses 'Define' which is inappropriate for Hard difficulty",
+        "Prompt uses 'Label' which is inappropriate for Hard difficulty",
+    ]
+    assert issues[2].startswith("Prompt should use at least one Hard-appropriate verb: Evaluate")
+
+
+def test_difficulty_constraints_insert_purpose_between_fixed_lines():
+    engine = DifficultyEngine()
+
+    lines = engine.generate_difficulty_constraints("connect", purpose="Mass vs weight").split("\n")
+
+    assert lines == [
+        "DIFFICULTY LEVEL: Medium",
+        "COGNITIVE FOCUS: Apply and Analyze (Bloom's Taxonomy)",
+        "PURPOSE: Mass vs weight",
+        "QUESTION VERBS: Use 'Compare', 'Explain', 'Calculate', 'Distinguish'",
+        "AVOID: List, Recall questions",
+    ]
+    assert "PURPOSE" not in engine.generate_difficulty_constraints("Medium")
+
+
+def test_difficulty_scores_order_aliases():
+    engine = DifficultyEngine()
+
+    assert [engine.get_difficulty_score(d) for d in ("basic", "moderate", "advanced")] == [1, 2, 3]
+
+
+def test_purpose_types_are_checked_in_priority_order():
+    engine = DifficultyEngine()
+    expected = [
+        ("Reinforce REASONING", "PURPOSE: Improve Assertion-Reasoning"),
+        ("reinforce mass vs weight", "PURPOSE: Clarify Distinction"),
+        ("real-world application", "PURPOSE: Reinforce Application"),
+        ("Have fun", "PURPOSE-DRIVEN FOCUS: Have fun"),
+    ]
+
+    for purpose, heading in expected:
+        assert engine.generate_purpose_prompt(purpose, "Forces").startswith(heading)
+
+
+def test_verb_and_level_getters_return_independent_lists():
+    engine = DifficultyEngine()
+
+    engine.get_question_verbs("Hard").append("Memorize")
+    engine.get_bloom_levels("Hard").clear()
+
+    assert "Memorize" not in engine.get_question_verbs("Hard")
+    assert engine.get_bloom_levels("Hard") == ["Evaluate", "Create"]
+    assert "'Evaluate', 'Design'" in engine.generate_difficulty_constraints("Hard")
+
+
+def test_engine_methods_work_without_an_instance():
+    constraints = DifficultyEngine.generate_difficulty_constraints("easy")
+    purpose_prompt = DifficultyEngine.generate_purpose_prompt("reinforce", "Forces")
+
+    assert DifficultyEngine.get_difficulty_score("advanced") == 3
+    assert constraints == DifficultyEngine().generate_difficulty_constraints("easy")
+    assert purpose_prompt.startswith("PURPOSE: Reinforce Application")
+
+
+def test_difficulty_tables_are_read_only():
+    with pytest.raises(TypeError):
+        DifficultyEngine.QUESTION_VERBS["Hard"] = ("Memorize",)
+    with pytest.raises(TypeError):
+        DifficultyEngine.TAXONOMY_MAP["Hard"]["levels"] = ()
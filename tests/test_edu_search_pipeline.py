@@ -0,0 +1,419 @@
+"""
+Tests for the educational search pipeline.
+Browser and network backends are replaced with in-process fakes.
+"""
+
+import asyncio
+
+import pytest
+
+from discovery.edu_search_pipeline import EduSearchPipeline, SearchSpec
+
+
+class FakeSearcher:
+    """Stands in for EducationalContentSearcher and counts browser lifecycles."""
+
+    def __init__(self):
+        self.starts = 0
+        self.closes = 0
+        self.queries = []
+
+    def start(self):
+        self.starts += 1
+
+    def close(self):
+        self.closes += 1
+
+    def search_bing(self, query, count=10, **kwargs):
+        self.queries.append(query)
+        return [{"title": "T", "url": f"https://www.ck12.org/{len(self.queries)}", "snippet": ""}]
+
+
+def make_pipeline(**kwargs):
+    kwargs.setdefault("cache_dir", None)
+    pipeline = EduSearchPipeline(**kwargs)
+    pipeline.searcher = FakeSearcher()
+    return pipeline
+
+
+def test_search_many_reuses_one_browser_session():
+    pipeline = make_pipeline()
+    specs = [
+        SearchSpec(grade=8, subject="Physics", topic="Vectors"),
+        SearchSpec(grade=3, subject="Math", topic="Addition", subtopic="Carrying"),
+    ]
+
+    results = pipeline.search_many(specs, method="bing")
+
+    assert len(results) == 2
+    assert results[0][0].url.endswith("/1")
+    assert results[1][0].url.endswith("/2")
+    assert "Vectors" in pipeline.searcher.queries[0]
+    assert "Carrying" in pipeline.searcher.queries[1]
+    assert pipeline.searcher.closes == 1
+
+
+def test_single_search_still_closes_browser():
+    pipeline = make_pipeline()
+    pipeline.search(grade=8, subject="Physics", topic="Vectors", method="bing")
+    assert pipeline.searcher.closes == 1
+
+
+def test_fetch_retries_navigation_errors(monkeypatch):
+    monkeypatch.setattr("discovery.edu_search_pipeline.time.sleep", lambda s: None)
+    pipeline = make_pipeline()
+    calls = []
+
+    def flaky_search(query, count=10, **kwargs):
+        calls.append(query)
+        if len(calls) < 3:
+            raise TimeoutError("navigation stalled")
+        return [{"title": "T", "url": "https://ck12.org/x", "snippet": ""}]
+
+    pipeline.searcher.search_bing = flaky_search
+    raw = pipeline.fetch("Grade 8 Physics Vectors")
+
+    assert len(calls) == 3
+    assert raw[0]["url"] == "https://ck12.org/x"
+
+
+def test_ddg_falls_back_to_relaxed_query(monkeypatch):
+    monkeypatch.setattr("discovery.edu_search_pipeline.DDGS", object)
+    monkeypatch.setattr("discovery.edu_search_pipeline.DDG_BACKENDS", ("auto",))
+    pipeline = make_pipeline()
+
+    def fake_ddg(query, max_results=10, backend="auto"):
+        if "site:" in query:
+            return []
+        return [{"title": "T", "url": "https://example.org/page", "snippet": ""}]
+
+    pipeline.fetch_ddg = fake_ddg
+    results = pipeline.search(
+        grade=8, subject="Physics", topic="Vectors",
+        method="ddg", strict_domain_filter=False,
+    )
+
+    assert [r.url for r in results] == ["https://example.org/page"]
+
+
+def test_fetch_serves_repeat_queries_from_disk_cache(tmp_path):
+    pipeline = make_pipeline(cache_dir=str(tmp_path))
+
+    first = pipeline.fetch("Grade 8 Physics Vectors")
+    second = pipeline.fetch("Grade 8 Physics Vectors")
+    refreshed = pipeline.fetch("Grade 8 Physics Vectors", force_refresh=True)
+
+    assert second == first
+    assert len(pipeline.searcher.queries) == 2
+    assert refreshed[0]["url"].endswith("/2")
+
+
+def test_trusted_domains_match_on_label_boundaries():
+    pipeline = make_pipeline()
+    raw = [
+        {"title": "a", "url": "https://fakeck12.org/x", "snippet": ""},
+        {"title": "b", "url": "https://www.ck12.org/y", "snippet": ""},
+        {"title": "c", "url": "https://kids.britannica.com/z", "snippet": ""},
+    ]
+
+    results = pipeline.filter_results(raw, ["ck12.org", "britannica.com"])
+
+    trusted = {r.domain: r.is_trusted for r in results}
+    assert trusted == {"ck12.org": True, "kids.britannica.com": True, "fakeck12.org": False}
+    assert [r.domain for r in results][:2] == ["ck12.org", "kids.britannica.com"]
+
+
+def test_blocked_domains_and_keywords():
+    pipeline = make_pipeline()
+    raw = [
+        {"title": "a", "url": "https://m.youtube.com/watch", "snippet": ""},
+        {"title": "b", "url": "https://spam.example.org/page", "snippet": ""},
+        {"title": "c", "url": "https://blocked.net/page", "snippet": ""},
+        {"title": "d", "url": "https://ok.org/lesson", "snippet": ""},
+        {"title": "e", "url": "https://ok.org/login", "snippet": ""},
+    ]
+
+    results = pipeline.filter_results(raw, [], blocked_domains=["spam", "blocked.net"])
+
+    assert [r.url for r in results] == ["https://ok.org/lesson"]
+
+
+def test_fetch_ddg_async_returns_first_non_empty_backend(monkeypatch):
+    monkeypatch.setattr("discovery.edu_search_pipeline.DDGS", object)
+    monkeypatch.setattr("discovery.edu_search_pipeline.DDG_BACKENDS", ("empty", "good"))
+    pipeline = make_pipeline()
+
+    def fake_ddg(query, max_results=10, backend="auto"):
+        if backend == "empty":
+            return []
+        return [{"title": "T", "url": "https://example.org/" + backend, "snippet": ""}]
+
+    pipeline.fetch_ddg = fake_ddg
+    raw = asyncio.run(pipeline.fetch_ddg_async("Grade 8 Physics Vectors"))
+
+    assert raw[0]["url"] == "https://example.org/good"
+
+
+def test_fetch_ddg_async_tries_backends_in_turn_and_stops_at_first_hit(monkeypatch):
+    monkeypatch.setattr("discovery.edu_search_pipeline.DDGS", object)
+    monkeypatch.setattr("discovery.edu_search_pipeline.DDG_BACKENDS", ("empty", "good", "unused"))
+    pipeline = make_pipeline()
+    calls = []
+
+    def fake_ddg(query, max_results=10, backend="auto"):
+        calls.append(backend)
+        if backend == "empty":
+            return []
+        return [{"title": "T", "url": "https://example.org/" + backend, "snippet": ""}]
+
+    pipeline.fetch_ddg = fake_ddg
+    asyncio.run(pipeline.fetch_ddg_async("Grade 8 Physics Vectors"))
+
+    assert calls == ["empty", "good"]
+
+
+@pytest.mark.parametrize("strict_hit", [True, False])
+def test_relaxed_ddg_query_is_sent_only_after_strict_comes_back_empty(monkeypatch, strict_hit):
+    monkeypatch.setattr("discovery.edu_search_pipeline.DDGS", object)
+    monkeypatch.setattr("discovery.edu_search_pipeline.DDG_BACKENDS", ("auto",))
+    pipeline = make_pipeline()
+    queries = []
+
+    def fake_ddg(query, max_results=10, backend="auto"):
+        queries.append(query)
+        if "site:" in query and not strict_hit:
+            return []
+        return [{"title": "T", "url": "https://www.ck12.org/page", "snippet": ""}]
+
+    pipeline.fetch_ddg = fake_ddg
+    pipeline.search(grade=8, subject="Physics", topic="Vectors", method="ddg")
+
+    assert len(queries) == (1 if strict_hit else 2)
+    assert "site:" in queries[0]
+
+
+def test_close_releases_browser_and_ddg_client():
+    class FakeDDGS:
+        exited = False
+
+        def __exit__(self, *exc):
+            FakeDDGS.exited = True
+
+    with make_pipeline() as pipeline:
+        pipeline._ddgs_clients.append(FakeDDGS())
+        searcher = pipeline.searcher
+
+    assert FakeDDGS.exited
+    assert pipeline._ddgs_clients == []
+    assert searcher.closes == 1
+
+
+def test_close_twice_is_a_noop_and_always_stops_the_worker():
+    pipeline = make_pipeline()
+    searcher = pipeline.searcher
+
+    def broken_close():
+        searcher.closes += 1
+        raise RuntimeError("browser already gone")
+
+    searcher.close = broken_close
+    with pytest.raises(RuntimeError, match="browser already gone"):
+        pipeline.close()
+    assert pipeline._browser_executor._shutdown
+
+    pipeline.close()
+    assert searcher.closes == 1
+
+
+def test_concurrent_ddg_workers_each_get_their_own_client(monkeypatch):
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    class FakeDDGS:
+        def __init__(self):
+            self.owner = threading.get_ident()
+
+    monkeypatch.setattr("discovery.edu_search_pipeline.DDGS", FakeDDGS)
+    pipeline = make_pipeline()
+    barrier = threading.Barrier(4)
+
+    def use_client(_):
+        barrier.wait(5)
+        client = pipeline._ddg_client()
+        assert pipeline._ddg_client() is client
+        return client
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        clients = list(pool.map(use_client, range(4)))
+
+    assert len({id(c) for c in clients}) == 4
+    assert all(c.owner != clients[0].owner for c in clients[1:])
+    assert len(pipeline._ddgs_clients) == 4
+
+
+def test_search_many_reports_failures_per_spec():
+    pipeline = make_pipeline()
+    original = pipeline.search_async
+
+    async def flaky_search_async(**kwargs):
+        if kwargs["topic"] == "Broken":
+            raise RuntimeError("boom")
+        return await original(**kwargs)
+
+    pipeline.search_async = flaky_search_async
+    specs = [
+        SearchSpec(grade=8, subject="Physics", topic="Broken"),
+        SearchSpec(grade=8, subject="Physics", topic="Vectors"),
+    ]
+
+    results = pipeline.search_many(specs, concurrency=2, method="bing")
+
+    assert isinstance(results[0], RuntimeError)
+    assert results[1][0].is_trusted
+
+
+def test_build_query_strips_special_characters():
+    pipeline = make_pipeline()
+    query = pipeline.build_query(8, "Physics", "Newton's #laws*\nof motion", subtopic="F = ma?")
+
+    assert query.startswith("Grade 8 Physics Newton's laws of motion F ma ")
+    assert "#" not in query and "*" not in query and "\n" not in query
+
+
+def test_ddg_gate_spaces_calls_per_backend(monkeypatch):
+    import discovery.edu_search_pipeline as esp
+
+    clock = [100.0]
+    slept = []
+    monkeypatch.setattr(esp, "_ddg_next_slot", {})
+    monkeypatch.setattr(esp.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(esp.time, "sleep", slept.append)
+
+    esp._ddg_gate("html")
+    esp._ddg_gate("lite")
+    esp._ddg_gate("html")
+    clock[0] += 5
+    esp._ddg_gate("html")
+
+    assert slept == [pytest.approx(esp.DDG_MIN_INTERVAL)]
+
+
+def test_site_filters_are_prebuilt_at_init():
+    from discovery.edu_search_pipeline import _site_filter
+
+    _site_filter.cache_clear()
+    pipeline = make_pipeline()
+    warmed = _site_filter.cache_info().currsize
+
+    domains = pipeline.resolve_domains(8, "physics")
+    query = pipeline.build_query(8, "physics", "Vectors", domains=domains)
+
+    assert warmed > 0
+    assert _site_filter.cache_info().currsize == warmed
+    assert "site:ck12.org" in query
+
+
+def test_filter_results_stops_reading_once_limit_is_trusted():
+    pipeline = make_pipeline()
+    consumed = []
+
+    def stream():
+        for i in range(10):
+            consumed.append(i)
+            yield {"title": "t", "url": f"https://www.ck12.org/{i}", "snippet": ""}
+
+    results = pipeline.filter_results(stream(), ["ck12.org"], limit=3)
+
+    assert [r.url for r in results] == [f"https://www.ck12.org/{i}" for i in range(3)]
+    assert consumed == [0, 1, 2]
+
+
+def test_search_result_is_slotted_and_serializes_every_field():
+    from dataclasses import fields
+    from discovery.edu_search_pipeline import SearchResult
+
+    result = SearchResult(title="t", url="https://ck12.org/x", snippet="s", domain="ck12.org", is_trusted=True)
+
+    assert not hasattr(result, "__dict__")
+    assert list(result.to_dict()) == [f.name for f in fields(SearchResult)]
+
+
+def test_netloc_of_fast_path_matches_urlsplit_fallback():
+    from discovery.edu_search_pipeline import _netloc_of
+
+    assert _netloc_of("https://www.ck12.org/x?y#z") == "ck12.org"
+    assert _netloc_of("http://kids.britannica.com") == "kids.britannica.com"
+    assert _netloc_of("https://user@www.ck12.org/x") == "user@ck12.org"
+    assert _netloc_of("https://[::1]:8080/x") == "[::1]:8080"
+    assert _netloc_of("https://[broken/x") == ""
+
+
+def test_failed_query_fails_fast_until_ttl_expires(monkeypatch):
+    import discovery.edu_search_pipeline as esp
+
+    monkeypatch.setattr(esp.time, "sleep", lambda s: None)
+    pipeline = make_pipeline(max_retries=2, fail_ttl_s=60)
+    calls = []
+
+    def broken_search(query, count=10, **kwargs):
+        calls.append(query)
+        raise TimeoutError("rate limited")
+
+    pipeline.searcher.search_bing = broken_search
+    for _ in range(2):
+        with pytest.raises(esp.SearchError):
+            pipeline.fetch("Grade 8 Physics Vectors")
+    assert len(calls) == 2
+
+    pipeline._fail_until = {k: 0.0 for k in pipeline._fail_until}
+    with pytest.raises(esp.SearchError):
+        pipeline.fetch("Grade 8 Physics Vectors")
+    assert len(calls) == 4
+
+
+def test_aclose_shuts_the_browser_down_on_its_thread():
+    import threading
+
+    pipeline = make_pipeline()
+    closed_on = []
+    pipeline.searcher.close = lambda: closed_on.append(threading.current_thread().name)
+
+    async def main():
+        async with pipeline:
+            pass
+
+    asyncio.run(main())
+
+    assert len(closed_on) == 1
+    assert closed_on[0].startswith("edu-search-browser")
+
+
+def test_aclose_twice_is_a_noop_and_always_stops_the_worker():
+    pipeline = make_pipeline()
+    searcher = pipeline.searcher
+
+    def broken_close():
+        searcher.closes += 1
+        raise RuntimeError("browser already gone")
+
+    searcher.close = broken_close
+
+    async def main():
+        with pytest.raises(RuntimeError, match="browser already gone"):
+            await pipeline.aclose()
+        await pipeline.aclose()
+
+    asyncio.run(main())
+    assert searcher.closes == 1
+    assert pipeline._browser_executor._shutdown
+
+
+def test_sync_search_refuses_to_run_inside_an_event_loop():
+    pipeline = make_pipeline()
+
+    async def main():
+        with pytest.raises(RuntimeError, match="await search_async"):
+            pipeline.search(grade=8, subject="Physics", topic="Vectors", method="bing")
+
+    asyncio.run(main())
+    assert pipeline.searcher.queries == []
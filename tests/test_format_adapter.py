@@ -0,0 +1,66 @@
+"""
+Tests for OutputFormatAdapter's prompt constraints.
+"""
+
+import pytest
+
+from prompt_modules.format_adapter import OutputFormatAdapter
+
+
+def test_format_rules_are_appended_for_the_normalized_format():
+    adapter = OutputFormatAdapter({"formats": ["Excel"]})
+
+    prompt = adapter.inject_format_rules("BASE", "htm")
+
+    assert prompt.startswith("BASE\n\nHTML FORMAT REQUIREMENTS:\n- Wrap output")
+    assert prompt.endswith("tex-mml-chtml.js\"></script>")
+    assert adapter.inject_format_rules("BASE", "unknown") == adapter.inject_format_rules("BASE", "markdown")
+
+
+def test_negative_constraints_are_appended_only_when_defined():
+    adapter = OutputFormatAdapter({"formats": ["csv"]})
+
+    assert adapter.add_negative_constraints("BASE", "CSV").startswith("BASE\n\nCRITICAL - DO NOT:\n- Do not add")
+    assert adapter.add_negative_constraints("BASE", "sheets") == "BASE"
+
+    adapter.get_negative_constraints("csv").append("mutated")
+    assert "mutated" not in adapter.add_negative_constraints("BASE", "csv")
+
+
+def test_rendered_blocks_are_cached_per_known_format_only():
+    adapter = OutputFormatAdapter({"formats": ["csv"]})
+    OutputFormatAdapter._format_rules_text.cache_clear()
+    OutputFormatAdapter._negative_text.cache_clear()
+
+    for name in ("csv", "CSV", "made-up-1", "made-up-2", "md"):
+        adapter.inject_format_rules("BASE", name)
+        adapter.add_negative_constraints("BASE", name)
+
+    assert OutputFormatAdapter._format_rules_text.cache_info().currsize == 2
+    assert OutputFormatAdapter._negative_text.cache_info().currsize == 2
+
+
+def test_csv_validation_checks_the_first_non_blank_text():
+    adapter = OutputFormatAdapter({"formats": ["csv"]})
+
+    assert adapter.validate_output_format("\n  ```csv\nID,Name\n```", "csv") == (True, [])
+    assert adapter.validate_output_format("\t\nColumn A,Column B", "csv") == (True, [])
+
+    is_valid, issues = adapter.validate_output_format("Here is your CSV:\nID,Name", "csv")
+    assert not is_valid
+    assert len(issues) == 2
+
+
+def test_format_only_methods_work_without_an_instance():
+    assert OutputFormatAdapter.inject_format_rules("BASE", "md") == OutputFormatAdapter({}).inject_format_rules("BASE", "md")
+    assert OutputFormatAdapter.validate_output_format("ID,Name", "csv") == (True, [])
+
+
+def test_format_tables_are_read_only():
+    constraints = OutputFormatAdapter.get_format_constraints("csv")
+
+    with pytest.raises(TypeError):
+        constraints["header"] = "changed"
+    with pytest.raises(TypeError):
+        OutputFormatAdapter.FORMAT_ALIASES["tsv"] = "csv"
+    assert isinstance(constraints["rules"], tuple)
@@ -0,0 +1,109 @@
+"""
+Tests for the HTML section extractor.
+Each test runs against the selectolax fast path (when installed) and the
+lxml fallback, which must produce identical documents.
+"""
+
+import pytest
+
+from extractors import html_extractor
+from extractors.html_extractor import extract
+
+
+@pytest.fixture(autouse=True, params=["lexbor", "lxml"])
+def backend(request, monkeypatch):
+    if request.param == "lexbor" and html_extractor.LexborHTMLParser is None:
+        pytest.skip("selectolax not installed")
+    if request.param == "lxml":
+        monkeypatch.setattr(html_extractor, "LexborHTMLParser", None)
+    return request.param
+
+
+PAGE = """
+<html><head><title>Home</title></head><body>
+  <nav><p>Site menu</p></nav>
+  <div class="main post-content">
+    <h1>Big <b>Idea</b></h1>
+    <p>Hello<br>World <i>x</i>y</p>
+    <table><tr><td>a</td><td>b</td></tr></table>
+    <h2>Next</h2>
+    <p>   spaced    out  </p>
+  </div>
+</body></html>
+"""
+
+
+def test_sections_follow_headings_inside_main_container():
+    doc = extract(PAGE, "https://example.org/page")
+
+    assert doc.title == "BigIdea"
+    assert [s.model_dump() for s in doc.sections] == [
+        {"heading": "BigIdea", "content": "Hello World x y a b"},
+        {"heading": "Next", "content": "spaced out"},
+    ]
+
+
+def test_og_title_wins_and_body_is_fallback_container():
+    html = (
+        '<html><head><meta property="og:title" content=" Photosynthesis "><title>x</title></head>'
+        "<body><p>Plants make food.</p></body></html>"
+    )
+    doc = extract(html, "https://example.org/p")
+
+    assert doc.title == "Photosynthesis"
+    assert doc.sections[0].heading == "General"
+    assert doc.sections[0].content == "Plants make food."
+
+
+def test_empty_document_yields_no_sections():
+    doc = extract("   ", "https://example.org/empty")
+
+    assert doc.title == "Untitled Artifact"
+    assert doc.sections == []
+
+
+def test_text_split_across_feed_chunks_is_reassembled(monkeypatch):
+    expected = extract(PAGE, "https://example.org/page")
+    monkeypatch.setattr(html_extractor, "_FEED_CHUNK", 5)
+
+    assert extract(PAGE, "https://example.org/page") == expected
+
+
+def test_first_container_in_document_order_wins():
+    html = (
+        '<html><body><div id="content"><p>outer</p><article><p>inner</p></article></div>'
+        "<main><p>later</p></main></body></html>"
+    )
+    doc = extract(html, "https://example.org/nested")
+
+    assert [s.content for s in doc.sections] == ["outer inner"]
+
+
+def test_script_and_style_text_stays_out_of_sections():
+    page = (
+        "<html><body><article>"
+        "<h2>Intro<style>h2{}</style></h2>"
+        "<p>hello<script>var x=1</script> world</p>"
+        "<li>item<noscript>enable JS</noscript></li>"
+        "</article></body></html>"
+    )
+
+    doc = extract(page, "https://example.org/page")
+
+    assert [s.model_dump() for s in doc.sections] == [
+        {"heading": "Intro", "content": "hello world item"},
+    ]
+
+
+@pytest.mark.parametrize("page", [
+    "<noscript><p>ns</p></noscript><p>ok</p>",
+    "<html><head><noscript><h2>ns</h2></noscript></head><body><p>ok</p></body></html>",
+    "<html><body><noscript><h2>ns</h2><p>ns</p></noscript><p>ok</p></body></html>",
+])
+def test_noscript_markup_is_dropped_by_both_backends(backend, page):
+    scan = html_extractor._scan_lexbor if backend == "lexbor" else html_extractor._scan_lxml
+
+    assert scan(page)[3] == [("p", "ok")]
+    assert [s.model_dump() for s in extract(page, "https://example.org/page").sections] == [
+        {"heading": "General", "content": "ok"},
+    ]
@@ -0,0 +1,66 @@
+"""
+Tests for PromptOrchestrator context parsing and prompt assembly.
+"""
+
+import pytest
+
+from prompt_modules import PromptOrchestrator
+
+
+def make_orchestrator(**context):
+    context.setdefault("grade", "Grade 8")
+    context.setdefault("topic", "Physics Gravity")
+    return PromptOrchestrator(context)
+
+
+def test_subject_is_first_known_subject_in_topic():
+    assert make_orchestrator(topic="Physics Gravity").subject == "Physics"
+    assert make_orchestrator(topic="history of MATHEMATICS").subject == "Math"
+    assert make_orchestrator(topic="Gravity").subject == "General"
+
+
+def test_keywords_merge_report_and_subtopics_without_case_duplicates():
+    orchestrator = make_orchestrator(
+        keywords_report="Gravity, mass ,, Orbit",
+        subtopics=["MASS", "microgravity"],
+    )
+
+    assert orchestrator.keywords == ["Gravity", "mass", "Orbit", "microgravity"]
+    assert make_orchestrator(subtopics="weight, Weight, inertia").keywords == ["weight", "inertia"]
+
+
+def test_keyword_lists_are_not_shared_between_orchestrators():
+    first = make_orchestrator(keywords_report="gravity")
+    first.keywords.append("mutated")
+
+    assert make_orchestrator(keywords_report="gravity").keywords == ["gravity"]
+
+
+def test_insert_after_line_matches_split_insert_join():
+    from prompt_modules import _insert_after_line
+
+    for text in ("", "one", "one\ntwo", "one\ntwo\nthree\n"):
+        for n in range(4):
+            lines = text.split("\n")
+            lines.insert(n, "NEW")
+            assert _insert_after_line(text, n, "NEW") == "\n".join(lines)
+
+
+def test_sub_modules_are_shared_between_orchestrators():
+    first = make_orchestrator(output_formats=["pdf", "html"])
+    second = make_orchestrator(output_formats=["pdf", "html"])
+    other = make_orchestrator(output_formats=["Excel"])
+
+    assert first.difficulty_engine is second.difficulty_engine is other.difficulty_engine
+    assert first.format_adapter is second.format_adapter
+    assert other.format_adapter.formats == ["sheets"]
+
+
+def test_build_all_prompts_builds_only_enabled_outputs(monkeypatch):
+    orchestrator = make_orchestrator(output_config={"handout": True, "quiz": True, "studyGuide": False})
+    monkeypatch.setattr(orchestrator, "build_study_guide_prompt", lambda ctx: pytest.fail("disabled"))
+
+    prompts = orchestrator.build_all_prompts()
+
+    assert list(prompts) == ["quiz", "handout"]
+    assert "CRITICAL - DO NOT" in prompts["quiz"]
@@ -0,0 +1,327 @@
+"""
+Tests for SearchManager's Google Custom Search pagination.
+HTTP is served by an in-process httpx.MockTransport.
+"""
+
+import functools
+
+import httpx
+import pytest
+
+from discovery import search_manager
+from discovery.search_manager import SearchManager
+
+
+@pytest.fixture(autouse=True)
+def empty_result_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(search_manager, "RESULT_CACHE_FILE", tmp_path / "search_cache.json")
+    monkeypatch.setattr(search_manager, "RETRY_BACKOFF_S", 0)
+    SearchManager.cache_clear()
+    yield
+    SearchManager.cache_clear()
+
+
+def make_manager(monkeypatch, handler):
+    monkeypatch.setattr(search_manager, "_GOOGLE_KEY", "key")
+    monkeypatch.setattr(search_manager, "_GOOGLE_CX", "cx")
+    monkeypatch.setattr(
+        search_manager.httpx, "AsyncClient",
+        functools.partial(httpx.AsyncClient, transport=httpx.MockTransport(handler)),
+    )
+    return SearchManager()
+
+
+def test_google_pages_are_requested_together_and_kept_in_order(monkeypatch):
+    requested = []
+
+    def handler(request):
+        start = int(request.url.params["start"])
+        num = int(request.url.params["num"])
+        requested.append((start, num))
+        return httpx.Response(200, json={
+            "items": [{"link": f"https://example.org/{start + i}"} for i in range(num)],
+            "queries": {"nextPage": [{"startIndex": start + num}]},
+        })
+
+    manager = make_manager(monkeypatch, handler)
+    urls = manager.search("photosynthesis", max_results=25, method="google")
+
+    assert sorted(requested) == [(1, 10), (11, 10), (21, 5)]
+    assert urls == [f"https://example.org/{i}" for i in range(1, 26)]
+
+
+def test_google_stops_at_first_empty_or_failed_page(monkeypatch):
+    def handler(request):
+        start = int(request.url.params["start"])
+        if start == 1:
+            return httpx.Response(200, json={"items": [{"link": "https://example.org/a"}]})
+        if start == 11:
+            return httpx.Response(500)
+        return httpx.Response(200, json={"items": [{"link": "https://example.org/late"}]})
+
+    manager = make_manager(monkeypatch, handler)
+    urls = manager.search("photosynthesis", max_results=30, method="google")
+
+    assert urls == ["https://example.org/a"]
+
+
+def test_google_first_page_failure_returns_empty(monkeypatch):
+    urls = make_manager(monkeypatch, lambda request: httpx.Response(403)).search(
+        "photosynthesis", max_results=10, method="google",
+    )
+
+    assert urls == []
+
+
+def test_searches_on_one_loop_share_a_pooled_client(monkeypatch):
+    import asyncio
+
+    created = []
+    async_client = httpx.AsyncClient
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(200, json={"items": [{"link": "https://example.org/a"}]}),
+    )
+
+    def client_factory(**kwargs):
+        client = async_client(transport=transport, **kwargs)
+        created.append(client)
+        return client
+
+    manager = make_manager(monkeypatch, transport.handler)
+    monkeypatch.setattr(search_manager.httpx, "AsyncClient", client_factory)
+
+    async def run_twice():
+        first = await manager.async_search("a", max_results=10, method="google")
+        second = await SearchManager().async_search("b", max_results=10, method="google")
+        await search_manager.close_http_client()
+        return first, second
+
+    first, second = asyncio.run(run_twice())
+
+    assert first == second == ["https://example.org/a"]
+    assert len(created) == 1 and created[0].is_closed
+
+
+def test_repeat_searches_are_served_from_result_cache(monkeypatch):
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.params["q"])
+        return httpx.Response(200, json={"items": [{"link": "https://example.org/a"}]})
+
+    manager = make_manager(monkeypatch, handler)
+    first = manager.search("Photosynthesis  Grade 7", max_results=10, method="google")
+    first.append("https://mutated.example")
+    second = manager.search("photosynthesis grade 7", max_results=10, method="google")
+
+    assert second == ["https://example.org/a"]
+    assert len(calls) == 1
+
+    SearchManager.cache_clear()
+    manager.search("photosynthesis grade 7", max_results=10, method="google")
+    assert len(calls) == 2
+
+
+def test_result_cache_round_trips_through_disk(tmp_path):
+    path = tmp_path / "cache.json"
+    cache = search_manager._ResultCache(maxsize=4, ttl_s=60)
+    cache.put(("ddg", "q", 10), ["https://example.org/a"])
+    cache.save(path)
+
+    warm = search_manager._ResultCache(maxsize=4, ttl_s=60)
+    warm.load(path)
+
+    assert warm.get(("ddg", "q", 10)) == ("https://example.org/a",)
+
+
+@pytest.mark.parametrize("payload", ['[[1]]', '{"a": 1}', '7', '[[["ddg", "q"], 1, []]]'])
+def test_result_cache_ignores_malformed_files(monkeypatch, tmp_path, payload):
+    path = tmp_path / "cache.json"
+    path.write_text(payload, encoding="utf-8")
+    monkeypatch.setattr(search_manager, "RESULT_CACHE_FILE", path)
+    cache = search_manager._ResultCache(maxsize=4, ttl_s=60)
+
+    assert cache.get(("ddg", "q", 10)) is None
+    cache.load(path)
+    assert cache.get(("ddg", "q", 10)) is None
+
+
+def test_auto_mode_does_not_call_google_while_ddg_answers(monkeypatch):
+    import time
+
+    google_calls = []
+
+    def handler(request):
+        google_calls.append(request)
+        return httpx.Response(200, json={"items": [{"link": "https://example.org/g"}]})
+
+    def slow_ddg(query, max_results):
+        # A realistic DDG round trip, well past the old 0.4s hedge delay
+        time.sleep(0.6)
+        return ["https://ddg.example/a"]
+
+    manager = make_manager(monkeypatch, handler)
+    monkeypatch.setattr(manager, "_search_ddg", slow_ddg)
+
+    urls = manager.search("photosynthesis", max_results=10, method="auto")
+
+    assert urls == ["https://ddg.example/a"]
+    assert google_calls == []
+
+
+@pytest.mark.parametrize("outcome", ["empty", "error"])
+def test_auto_mode_falls_back_to_google_after_ddg(monkeypatch, outcome):
+    def ddg(query, max_results):
+        if outcome == "error":
+            raise RuntimeError("ddg down")
+        return []
+
+    manager = make_manager(
+        monkeypatch,
+        lambda request: httpx.Response(200, json={"items": [{"link": "https://example.org/g"}]}),
+    )
+    monkeypatch.setattr(manager, "_search_ddg", ddg)
+
+    urls = manager.search("photosynthesis", max_results=10, method="auto")
+
+    assert urls == ["https://example.org/g"]
+
+
+def test_auto_mode_returns_google_when_ddg_stalls(monkeypatch):
+    import threading
+
+    google_fired = threading.Event()
+
+    def stalled_ddg(query, max_results):
+        # Only unblocks once the hedged Google request has gone out
+        google_fired.wait(5)
+        return []
+
+    def handler(request):
+        google_fired.set()
+        return httpx.Response(200, json={"items": [{"link": "https://example.org/g"}]})
+
+    manager = make_manager(monkeypatch, handler)
+    manager.hedge_delay_s = 0.01
+    monkeypatch.setattr(manager, "_search_ddg", stalled_ddg)
+
+    urls = manager.search("photosynthesis", max_results=10, method="auto")
+
+    assert urls == ["https://example.org/g"]
+
+
+def test_auto_mode_prefers_ddg_when_it_answers_first(monkeypatch):
+    google_calls = []
+
+    def handler(request):
+        google_calls.append(request)
+        return httpx.Response(200, json={"items": [{"link": "https://example.org/g"}]})
+
+    manager = make_manager(monkeypatch, handler)
+    manager.hedge_delay_s = 5
+    monkeypatch.setattr(
+        manager, "_search_ddg", lambda query, max_results: ["https://ddg.example/a"],
+    )
+
+    urls = manager.search("photosynthesis", max_results=10, method="auto")
+
+    assert urls == ["https://ddg.example/a"]
+    assert google_calls == []
+
+
+def test_reload_env_picks_up_injected_credentials(monkeypatch):
+    monkeypatch.setattr(search_manager, "_GOOGLE_KEY", None)
+    monkeypatch.setattr(search_manager, "_GOOGLE_CX", None)
+    monkeypatch.setenv("GOOGLE_SEARCH_API_KEY", "injected-key")
+    monkeypatch.setenv("GOOGLE_SEARCH_CX", "injected-cx")
+
+    assert SearchManager().google_api_key is None
+
+    SearchManager.reload_env()
+    manager = SearchManager()
+
+    assert (manager.google_api_key, manager.google_cx) == ("injected-key", "injected-cx")
+
+
+def test_google_stops_after_page_without_next_page(monkeypatch):
+    def handler(request):
+        start = int(request.url.params["start"])
+        data = {"items": [{"link": f"https://example.org/{start}"}]}
+        if start == 1:
+            data["queries"] = {"nextPage": [{"startIndex": 11}]}
+        return httpx.Response(200, json=data)
+
+    manager = make_manager(monkeypatch, handler)
+    urls = manager.search("photosynthesis", max_results=40, method="google")
+
+    assert urls == ["https://example.org/1", "https://example.org/11"]
+
+
+def test_ddg_drops_duplicates_and_stops_at_max_results(monkeypatch):
+    consumed = []
+
+    class FakeDDGS:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def text(self, query, max_results=10):
+            for href in [
+                "https://a.org", "https://a.org", None,
+                "https://b.org", "https://c.org", "https://d.org",
+            ]:
+                consumed.append(href)
+                yield {"href": href}
+
+    monkeypatch.setattr(search_manager, "DDGS", FakeDDGS)
+
+    urls = SearchManager().search("photosynthesis", max_results=3, method="ddg")
+
+    assert urls == ["https://a.org", "https://b.org", "https://c.org"]
+    assert len(consumed) == 5
+
+
+def test_google_retries_transient_statuses(monkeypatch):
+    attempts = []
+
+    def handler(request):
+        attempts.append(request.url.params["start"])
+        if len(attempts) < 3:
+            return httpx.Response(503 if len(attempts) == 1 else 429)
+        return httpx.Response(200, json={"items": [{"link": "https://example.org/a"}]})
+
+    manager = make_manager(monkeypatch, handler)
+    urls = manager.search("photosynthesis", max_results=10, method="google")
+
+    assert urls == ["https://example.org/a"]
+    assert len(attempts) == 3
+
+
+def test_ddg_retries_rate_limits(monkeypatch):
+    class RateLimited(Exception):
+        pass
+
+    calls = []
+
+    class FakeDDGS:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def text(self, query, max_results=10):
+            calls.append(query)
+            if len(calls) == 1:
+                raise RateLimited("202 Ratelimit")
+            yield {"href": "https://a.org"}
+
+    monkeypatch.setattr(search_manager, "DDGS", FakeDDGS)
+    monkeypatch.setattr(search_manager, "RatelimitException", RateLimited)
+
+    urls = SearchManager().search("photosynthesis", max_results=3, method="ddg")
+
+    assert urls == ["https://a.org"]
+    assert len(calls) == 2
@@ -10,6 +10,7 @@ Based on Phase 4 of the implementation plan.
 import os
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional
 from pathlib import Path
 
@@ -405,49 +406,73 @@ class FormatConverter:
             logger.error(f"Error converting Markdown to DOCX: {e}")
             return ""
 
-    def batch_convert(self, content: str, formats: List[str], base_name: str,
-                     content_type: str = 'markdown') -> dict:
+    def _conversion_tasks(self, content: str, formats: List[str], base_name: str,
+                          content_type: str = 'markdown') -> list:
         """
-        Convert content to multiple formats.
-
-        Args:
-            content: Raw content (CSV or Markdown)
-            formats: List of target formats ('csv', 'excel', 'pdf', 'html', 'docx')
-            base_name: Base filename (without extension)
-            content_type: Type of input content ('csv' or 'markdown')
-
-        Returns:
-            Dictionary mapping format to output path
+        (result key, zero-arg conversion) pairs for batch_convert(), in
+        format order. Unsupported format/content combinations are skipped.
         """
-        logger.info(f"Batch converting {base_name} to formats: {formats}")
-
-        results = {}
+        tasks = []
 
         for fmt in formats:
             fmt_lower = fmt.lower()
 
             if fmt_lower in ['excel', 'xlsx'] and content_type == 'csv':
-                path = self.csv_to_excel(content, base_name)
-                if path:
-                    results['excel'] = path
+                tasks.append(('excel', lambda: self.csv_to_excel(content, base_name)))
 
             elif fmt_lower == 'html':
                 if content_type == 'markdown':
-                    path = self.markdown_to_html(content, base_name)
-                    if path:
-                        results['html'] = path
+                    tasks.append(('html', lambda: self.markdown_to_html(content, base_name)))
 
             elif fmt_lower == 'pdf':
                 if content_type == 'markdown':
-                    path = self.markdown_to_pdf(content, base_name)
-                    if path:
-                        results['pdf'] = path
+                    tasks.append(('pdf', lambda: self.markdown_to_pdf(content, base_name)))
 
             elif fmt_lower in ['docx', 'word']:
                 if content_type == 'markdown':
-                    path = self.markdown_to_docx(content, base_name)
-                    if path:
-                        results['docx'] = path
+                    tasks.append(('docx', lambda: self.markdown_to_docx(content, base_name)))
+
+        return tasks
+
+    @staticmethod
+    def _run_conversions(tasks: list) -> dict:
+        """
+        Run conversions on worker threads so their file I/O and library work
+        overlap. Results are merged in task order, so when two tasks share a
+        key the later one wins, as with sequential conversion.
+        """
+        if not tasks:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(len(tasks), 4),
+                                thread_name_prefix="format-convert") as pool:
+            futures = [(key, pool.submit(convert)) for key, convert in tasks]
+            results = {}
+            for key, future in futures:
+                path = future.result()
+                if path:
+                    results[key] = path
+        return results
+
+    def batch_convert(self, content: str, formats: List[str], base_name: str,
+                     content_type: str = 'markdown') -> dict:
+        """
+        Convert content to multiple formats.
+        The formats are converted concurrently.
+
+        Args:
+            content: Raw content (CSV or Markdown)
+            formats: List of target formats ('csv', 'excel', 'pdf', 'html', 'docx')
+            base_name: Base filename (without extension)
+            content_type: Type of input content ('csv' or 'markdown')
+
+        Returns:
+            Dictionary mapping format to output path
+        """
+        logger.info(f"Batch converting {base_name} to formats: {formats}")
+
+        results = self._run_conversions(
+            self._conversion_tasks(content, formats, base_name, content_type)
+        )
 
         logger.info(f"✓ Batch conversion complete: {len(results)} files created")
         return results
@@ -456,6 +481,7 @@ class FormatConverter:
                                      output_formats: List[str]) -> dict:
         """
         Convert NotebookLM artifacts to specified formats.
+        Every artifact/format conversion runs concurrently in one pool.
 
         Args:
             artifacts: Dict from NotebookLM with keys: quiz_csv, study_guide_md, visuals_md
@@ -467,39 +493,38 @@ class FormatConverter:
         """
         logger.info(f"Converting NotebookLM artifacts for: {base_name}")
 
-        all_files = {}
+        tasks = []
 
         # Convert quiz CSV
         if 'quiz_csv' in artifacts and artifacts['quiz_csv']:
-            quiz_files = self.batch_convert(
+            tasks += self._conversion_tasks(
                 content=artifacts['quiz_csv'],
                 formats=['excel'] if 'excel' in output_formats or 'xlsx' in output_formats else [],
                 base_name=f"{base_name}_quiz",
                 content_type='csv'
             )
-            all_files.update(quiz_files)
 
         # Convert study guide
         if 'study_guide_md' in artifacts and artifacts['study_guide_md']:
             guide_formats = [f for f in output_formats if f.lower() in ['pdf', 'html', 'docx', 'word']]
-            guide_files = self.batch_convert(
+            tasks += self._conversion_tasks(
                 content=artifacts['study_guide_md'],
                 formats=guide_formats,
                 base_name=f"{base_name}_study_guide",
                 content_type='markdown'
             )
-            all_files.update(guide_files)
 
         # Convert visuals/handout
         if 'visuals_md' in artifacts and artifacts['visuals_md']:
             visual_formats = [f for f in output_formats if f.lower() in ['html', 'pdf']]
-            visual_files = self.batch_convert(
+            tasks += self._conversion_tasks(
                 content=artifacts['visuals_md'],
                 formats=visual_formats,
                 base_name=f"{base_name}_handout",
                 content_type='markdown'
             )
-            all_files.update(visual_files)
+
+        all_files = self._run_conversions(tasks)
 
         logger.info(f"✓ NotebookLM artifact conversion complete: {len(all_files)} files")
         return all_files